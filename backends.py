@@ -0,0 +1,261 @@
+"""Pluggable search backends and federated fan-out across them.
+
+A backend turns (query, start) into a page of items in the schema
+display_results expects: title, price (display string), thumbnail, link,
+product_link and source. Each one enforces its own concurrency limit,
+request timeout and call quota, so a slow or expensive marketplace can't
+starve the others. FederatedSearch sends one query to several backends at
+once and, with a hedge deadline, returns whatever has arrived by then.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import requests
+
+from cache import make_cache_key
+from client import QuotaBudget, QuotaExceededError, SerpApiClient
+from decoding import project_result
+from fetcher import BASE_URL, MAX_WORKERS, PAGE_SIZE, fetch_shopping_page
+from product_index import merge_unique
+from tracing import bind, span
+
+MAX_CONCURRENCY = MAX_WORKERS
+TIMEOUT = 10
+QUOTA_PERIOD = 60 * 60
+# e.g. SNIPESTYLE_ENGINES=google_shopping,ebay,walmart SNIPESTYLE_HEDGE_MS=1500
+ENGINES = [name.strip() for name in os.environ.get('SNIPESTYLE_ENGINES', 'google_shopping').split(',') if name.strip()]
+HEDGE_DEADLINE = float(os.environ['SNIPESTYLE_HEDGE_MS']) / 1000 if os.environ.get('SNIPESTYLE_HEDGE_MS') else None
+BUDGET_TYPES = {'max_concurrency': int, 'timeout': float, 'quota': int, 'quota_period': float}
+
+
+def parse_budgets(spec):
+    """Parse 'walmart:quota=100,max_concurrency=2,timeout=3;ebay:quota=500' into build_search budgets"""
+    budgets = {}
+    for entry in filter(None, (part.strip() for part in spec.split(';'))):
+        name, _, settings = entry.partition(':')
+        budget = budgets.setdefault(name.strip(), {})
+        for setting in filter(None, (part.strip() for part in settings.split(','))):
+            key, _, value = (part.strip() for part in setting.partition('='))
+            if key not in BUDGET_TYPES:
+                raise ValueError(f'Unknown budget setting {key!r} for {name.strip()!r}; expected one of '
+                                 f'{", ".join(BUDGET_TYPES)}')
+            budget[key] = BUDGET_TYPES[key](value)
+    return budgets
+
+
+# e.g. SNIPESTYLE_BUDGETS='walmart:quota=100,max_concurrency=2,timeout=3;ebay:quota=500'
+BUDGETS = parse_budgets(os.environ.get('SNIPESTYLE_BUDGETS', ''))
+
+
+class Backend:
+    """Base class: subclasses set `name` and implement fetch_page(query, start) -> {'results', 'has_next'}"""
+
+    name = None
+
+    def __init__(self, max_concurrency=MAX_CONCURRENCY, timeout=TIMEOUT, quota=None, quota_period=QUOTA_PERIOD):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.quota = QuotaBudget(quota, quota_period) if quota else None
+        self.stats = {'calls': 0, 'errors': 0, 'quota_rejections': 0, 'dropped': 0}
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+
+    def search(self, query, start=0):
+        """Fetch one normalized page within this backend's concurrency and quota budget"""
+        if self.quota is not None and not self.quota.try_acquire():
+            self._count('quota_rejections')
+            raise QuotaExceededError(f'{self.name} has used its quota of {self.quota.limit} calls')
+        with self._slots, span('backend', backend=self.name, query=query, start=start) as backend_span:
+            self._count('calls')
+            try:
+                page = self.fetch_page(query, start)
+            except requests.exceptions.RequestException:
+                self._count('errors')
+                raise
+            backend_span.set(items=len(page['results']))
+        return page
+
+    def fetch_page(self, query, start):
+        raise NotImplementedError
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+
+class SerpApiBackend(Backend):
+    """A SerpAPI engine; subclasses describe its parameters and result shape"""
+
+    engine = None
+    query_param = 'q'
+    results_key = 'organic_results'
+
+    def __init__(self, api_key, base_url=BASE_URL, client=None, **budget):
+        super().__init__(**budget)
+        self.name = self.name or self.engine
+        self.api_key = api_key
+        self.base_url = base_url
+        self.client = client or SerpApiClient(pool_size=self.max_concurrency, read_timeout=self.timeout)
+
+    def fetch_page(self, query, start):
+        params = {'engine': self.engine, self.query_param: query, 'api_key': self.api_key}
+        params.update(self.page_params(start))
+        data = self.client.get_json(self.base_url, params, deadline=self.timeout)
+        results = [item for item in map(self.normalize, data.get(self.results_key) or ()) if item.get('title')]
+        pagination = data.get('serpapi_pagination') or {}
+        return {'results': results, 'has_next': bool(pagination.get('next'))}
+
+    def page_params(self, start):
+        return {'start': start}
+
+    def normalize(self, item):
+        return project_result(item)
+
+
+class GoogleShoppingBackend(SerpApiBackend):
+    engine = 'google_shopping'
+
+    def fetch_page(self, query, start):
+        # Goes through fetch_shopping_page for its projected decoding.
+        return fetch_shopping_page(query, self.api_key, start=start, base_url=self.base_url, client=self.client,
+                                   deadline=self.timeout)
+
+
+class EbayBackend(SerpApiBackend):
+    engine = 'ebay'
+    query_param = '_nkw'
+
+    def page_params(self, start):
+        return {'_pgn': start // PAGE_SIZE + 1, '_ipg': PAGE_SIZE}
+
+    def normalize(self, item):
+        price = item.get('price') or {}
+        if 'from' in price and 'to' in price:
+            price_text = f"{price['from'].get('raw')} to {price['to'].get('raw')}"
+        else:
+            price_text = price.get('raw')
+        return {
+            'title': item.get('title'),
+            'price': price_text or 'Price not available',
+            'thumbnail': item.get('thumbnail'),
+            'link': item.get('link'),
+            'source': 'eBay',
+        }
+
+
+class WalmartBackend(SerpApiBackend):
+    engine = 'walmart'
+    query_param = 'query'
+
+    def page_params(self, start):
+        return {'page': start // PAGE_SIZE + 1}
+
+    def normalize(self, item):
+        offer = item.get('primary_offer') or {}
+        price = offer.get('offer_price')
+        return {
+            'title': item.get('title'),
+            'price': f'${price:,.2f}' if isinstance(price, (int, float)) else 'Price not available',
+            'thumbnail': item.get('thumbnail'),
+            'link': item.get('product_page_url'),
+            'source': item.get('seller_name') or 'Walmart',
+        }
+
+
+BACKENDS = {backend.engine: backend for backend in (GoogleShoppingBackend, EbayBackend, WalmartBackend)}
+
+
+def interleave(result_lists):
+    """Round-robin the lists so every backend's best results reach the first screen"""
+    lists = [results for results in result_lists if results]
+    merged = []
+    for position in range(max(map(len, lists), default=0)):
+        merged.extend(results[position] for results in lists if position < len(results))
+    return merged
+
+
+class FederatedSearch:
+    """Fans one query out to several backends and merges their pages.
+
+    With `hedge_deadline` (seconds) the merged page is returned as soon as the
+    deadline passes, dropping backends that have not answered; such pages are
+    marked partial. Without it every backend is awaited. Each backend gets its
+    own worker pool sized to its max_concurrency, so requests queued behind a
+    slow backend never hold threads the others need.
+
+    With a `cache` (a ResponseCache) each backend's page is cached on its own
+    as soon as it arrives, stragglers included, and fresh ones are used
+    without a call, so a backend that misses the deadline once is still
+    merged into the next search for the same page.
+    """
+
+    def __init__(self, backends, hedge_deadline=None, cache=None):
+        self.backends = list(backends)
+        self.name = '+'.join(backend.name for backend in self.backends)
+        self.hedge_deadline = hedge_deadline
+        self.cache = cache
+        self._pools = {backend: ThreadPoolExecutor(max_workers=backend.max_concurrency,
+                                                   thread_name_prefix=f'backend-{backend.name}')
+                       for backend in self.backends}
+
+    def search(self, query, start=0):
+        cached = {backend: self._cached(backend, query, start) for backend in self.backends}
+        futures = {backend: self._pools[backend].submit(bind(self._fetch), backend, query, start)
+                   for backend, page in cached.items() if page is None}
+        done, pending = wait(futures.values(), timeout=self.hedge_deadline)
+
+        pages = []
+        errors = []
+        for backend in self.backends:
+            future = futures.get(backend)
+            if future is None:
+                pages.append(cached[backend])
+            elif future in pending:
+                # The request keeps running on its worker; with a cache its page is kept for the next search,
+                # otherwise it is discarded and cancel() saves the call if it is still queued.
+                if self.cache is None:
+                    future.cancel()
+                backend._count('dropped')
+            elif future.exception() is not None:
+                errors.append(future.exception())
+            else:
+                pages.append(future.result())
+
+        if not pages:
+            if errors:
+                raise errors[0]
+            return {'results': [], 'has_next': False, 'partial': True}
+        return {
+            'results': merge_unique(interleave(page['results'] for page in pages)),
+            'has_next': any(page['has_next'] for page in pages),
+            'partial': bool(pending or errors),
+        }
+
+    def _fetch(self, backend, query, start):
+        page = backend.search(query, start)
+        if self.cache is not None:
+            self.cache.set(make_cache_key(query, engine=backend.name, start=start), page)
+        return page
+
+    def _cached(self, backend, query, start):
+        if self.cache is None:
+            return None
+        entry = self.cache.get(make_cache_key(query, engine=backend.name, start=start))
+        if entry is None or time.time() - entry[1] > self.cache.ttl:
+            return None
+        return entry[0]
+
+
+def build_search(names, api_key, base_url=BASE_URL, client=None, hedge_deadline=None, budgets=None, cache=None):
+    """Build a backend (or a FederatedSearch over several) from engine names like ['google_shopping', 'ebay']"""
+    unknown = [name for name in names if name not in BACKENDS]
+    if unknown:
+        raise ValueError(f'Unknown search engine {", ".join(map(repr, unknown))}; expected one of '
+                         f'{", ".join(BACKENDS)}')
+    budgets = budgets or {}
+    backends = [BACKENDS[name](api_key, base_url=base_url, client=client, **budgets.get(name, {})) for name in names]
+    if len(backends) == 1 and hedge_deadline is None:
+        return backends[0]
+    return FederatedSearch(backends, hedge_deadline, cache)
@@ -0,0 +1,236 @@
+"""Headless bulk price sweeps.
+
+Reads queries with optional price bounds from a CSV (query,min_price,max_price)
+or JSONL file, fetches them concurrently under one shared rate limit, and
+streams the in-range items out as JSONL or Parquet. Finished queries are
+recorded in a checkpoint file so an interrupted sweep resumes where it
+stopped.
+
+    python batch.py queries.csv results.jsonl --workers 8 --rate 5
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+
+from client import BURST, SerpApiClient
+from fetcher import BASE_URL, fetch_shopping_results, load_api_key
+from price_normalize import normalize_price
+from prices import filter_results_by_price
+
+OUTPUT_FIELDS = ('query', 'title', 'price', 'price_value', 'currency', 'price_usd', 'source', 'link', 'thumbnail')
+FLOAT_FIELDS = ('price_value', 'price_usd')
+
+
+def read_jobs(path):
+    """Yield (query, min_price, max_price) from a CSV or JSONL file"""
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            rows = csv.DictReader(f)
+        for row in rows:
+            query = str(row.get('query') or '').strip()
+            if query:
+                yield query, _bound(row.get('min_price')), _bound(row.get('max_price'))
+
+
+def _bound(value):
+    return float(value) if value not in (None, '') else None
+
+
+def job_key(job):
+    query, min_price, max_price = job
+    return json.dumps([query, min_price, max_price])
+
+
+def load_checkpoint(path):
+    """Return (job keys already written, JSONL output size they cover or None).
+
+    Lines are "<job key>\t<output offset>"; Parquet sweeps leave the offset out,
+    and a line with only an offset marks where a sweep started writing.
+    """
+    done = set()
+    offset = None
+    if not os.path.exists(path):
+        return done, offset
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            key, _, position = line.rstrip('\n').partition('\t')
+            if key:
+                done.add(key)
+            if position:
+                offset = int(position)
+    return done, offset
+
+
+def to_rows(query, results):
+    """price_value is in the listing's currency; price_usd is what the min/max bounds were applied to"""
+    for item in results:
+        price = normalize_price(item.get('price', ''))
+        yield {
+            'query': query,
+            'title': item.get('title'),
+            'price': item.get('price'),
+            'price_value': price.amount,
+            'currency': price.currency,
+            'price_usd': price.base_amount,
+            'source': item.get('source'),
+            'link': item.get('link') or item.get('product_link'),
+            'thumbnail': item.get('thumbnail'),
+        }
+
+
+class JsonlWriter:
+    """Appends rows to one JSONL file; write() returns the file size once the rows are on disk"""
+
+    def __init__(self, path, resume_at=None):
+        self._file = open(path, 'a', encoding='utf-8')
+        if resume_at is not None:
+            # Rows past the last checkpointed offset belong to queries that will be fetched again.
+            self._file.truncate(resume_at)
+        self.offset = self._file.tell()
+
+    def write(self, rows):
+        for row in rows:
+            self._file.write(json.dumps(row) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.offset = self._file.tell()
+        return self.offset
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetWriter:
+    """Writes one part file per run into the output directory, one row group per query.
+
+    The part is written under a .tmp name and renamed on close, so a crashed
+    run never leaves a truncated part; write() returns None because nothing
+    is durable before then.
+    """
+
+    offset = None
+
+    def __init__(self, directory):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        os.makedirs(directory, exist_ok=True)
+        part = len([name for name in os.listdir(directory) if name.endswith('.parquet')])
+        self._pa = pa
+        self._schema = pa.schema([(field, pa.float64() if field in FLOAT_FIELDS else pa.string())
+                                  for field in OUTPUT_FIELDS])
+        self._path = os.path.join(directory, f'part-{part:05d}.parquet')
+        self._writer = pq.ParquetWriter(self._path + '.tmp', self._schema)
+
+    def write(self, rows):
+        rows = list(rows)
+        if rows:
+            self._writer.write_table(self._pa.Table.from_pylist(rows, schema=self._schema))
+        return None
+
+    def close(self):
+        self._writer.close()
+        os.replace(self._path + '.tmp', self._path)
+
+
+def run_sweep(jobs, fetch, writer, checkpoint_path, workers, log=sys.stderr):
+    """Fetch every job not yet in the checkpoint, writing results and checkpointing as each one finishes.
+
+    A job is checkpointed only once its rows are durable: right after a JSONL
+    write, or when the writer is closed (which run_sweep does) for Parquet.
+    """
+    done, _ = load_checkpoint(checkpoint_path)
+    stats = {'done': 0, 'skipped': 0, 'failed': 0, 'items': 0}
+
+    def unfinished(jobs):
+        for job in jobs:
+            if job_key(job) in done:
+                stats['skipped'] += 1
+            else:
+                yield job
+
+    jobs = unfinished(jobs)
+    deferred = []
+    with ThreadPoolExecutor(max_workers=workers) as pool, open(checkpoint_path, 'a', encoding='utf-8') as checkpoint:
+        if writer.offset is not None:
+            checkpoint.write(f'\t{writer.offset}\n')
+            checkpoint.flush()
+        try:
+            # Keep a bounded number of jobs in flight so huge input files are streamed, not loaded.
+            pending = {}
+            for job in jobs:
+                pending[pool.submit(fetch, job[0])] = job
+                if len(pending) >= workers * 2:
+                    break
+
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    job = pending.pop(future)
+                    query, min_price, max_price = job
+                    try:
+                        results = filter_results_by_price(future.result(), min_price, max_price)
+                    except requests.exceptions.RequestException as e:
+                        stats['failed'] += 1
+                        print(f"Error fetching data for '{query}': {e}", file=log)
+                    else:
+                        offset = writer.write(to_rows(query, results))
+                        if offset is None:
+                            deferred.append(job)
+                        else:
+                            checkpoint.write(f'{job_key(job)}\t{offset}\n')
+                            checkpoint.flush()
+                        stats['done'] += 1
+                        stats['items'] += len(results)
+
+                    next_job = next(jobs, None)
+                    if next_job is not None:
+                        pending[pool.submit(fetch, next_job[0])] = next_job
+        finally:
+            writer.close()
+            checkpoint.writelines(job_key(job) + '\n' for job in deferred)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run a headless price sweep over a file of queries.')
+    parser.add_argument('input', help='CSV or JSONL file with query, min_price, max_price')
+    parser.add_argument('output', help='JSONL file, or a directory of part files with --format parquet')
+    parser.add_argument('--format', choices=['jsonl', 'parquet'], default='jsonl')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--rate', type=float, default=5, help='global request rate limit per second')
+    parser.add_argument('--checkpoint', help='defaults to <output>.checkpoint')
+    parser.add_argument('--api-key', help='defaults to SERPAPI_API_KEY or the api_key module')
+    parser.add_argument('--base-url', default=BASE_URL)
+    args = parser.parse_args(argv)
+
+    api_key = args.api_key or load_api_key()
+
+    client = SerpApiClient(pool_size=args.workers, rate=args.rate, burst=min(BURST, args.workers))
+
+    def fetch(query):
+        return fetch_shopping_results(query, api_key, base_url=args.base_url, client=client)
+
+    checkpoint_path = args.checkpoint or args.output.rstrip('/') + '.checkpoint'
+    if args.format == 'parquet':
+        writer = ParquetWriter(args.output)
+    else:
+        writer = JsonlWriter(args.output, resume_at=load_checkpoint(checkpoint_path)[1])
+    started = time.perf_counter()
+    stats = run_sweep(read_jobs(args.input), fetch, writer, checkpoint_path, args.workers)
+
+    print(f"{stats['done']} queries done, {stats['skipped']} already checkpointed, {stats['failed']} failed, "
+          f"{stats['items']} items in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return 1 if stats['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
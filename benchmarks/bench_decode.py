@@ -0,0 +1,74 @@
+"""Decode time and memory for SerpAPI shopping payloads.
+
+Compares response.json()-style full decoding with the projected decoders in
+decoding.py on the recorded fixtures, and on a large payload built from them
+(every fixture's results repeated, plus inline results and ads, as a
+num=100 response with a busy results page looks).
+
+Run from the repository root with: python -m benchmarks.bench_decode
+"""
+import json
+import os
+import statistics
+import time
+import tracemalloc
+
+import decoding
+from mock_serpapi import FIXTURES_DIR
+
+ROUNDS = 20
+LARGE_REPEATS = 8
+
+
+def load_payloads():
+    payloads = {}
+    bodies = []
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        with open(os.path.join(FIXTURES_DIR, name), 'rb') as f:
+            body = f.read()
+        payloads[name[:-len('.json')]] = body
+        bodies.append(json.loads(body))
+
+    results = [item for body in bodies for item in body['shopping_results']]
+    large = dict(bodies[0], shopping_results=results * LARGE_REPEATS, inline_shopping_results=results,
+                 ads=results[:60], serpapi_pagination={'next': 'https://serpapi.com/search.json?start=100'})
+    payloads['large (combined)'] = json.dumps(large).encode()
+    return payloads
+
+
+def decoders():
+    yield 'json.loads (baseline)', json.loads
+    yield 'stdlib + projection', lambda body: decoding.project_response(json.loads(body))
+    if decoding.orjson is not None:
+        yield 'orjson + projection', lambda body: decoding.project_response(decoding.orjson.loads(body))
+    if decoding.ijson is not None:
+        yield 'ijson stream', decoding._decode_stream
+    yield 'decode_shopping_response', decoding.decode_shopping_response
+
+
+def measure(decode, body):
+    samples = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        decode(body)
+        samples.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    result = decode(body)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return statistics.median(samples), peak / 1024, retained / 1024
+
+
+def main():
+    for name, body in load_payloads().items():
+        print(f'{name}: {len(body) / 1024:.0f} KiB')
+        print(f"  {'decoder':<26} {'median ms':>10} {'peak KiB':>10} {'kept KiB':>10}")
+        for label, decode in decoders():
+            ms, peak, retained = measure(decode, body)
+            print(f'  {label:<26} {ms:>10.2f} {peak:>10.0f} {retained:>10.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Sequential vs concurrent fetch latency against a local stub server.
+
+Run from the repository root with: python -m benchmarks.bench_fetch
+"""
+import statistics
+import time
+
+from benchmarks.stub_server import start_stub_server
+from client import SerpApiClient
+from fetcher import fetch_concurrently, fetch_shopping_results
+
+ROUNDS = 30
+QUERY_COUNTS = [1, 3, 10]
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_sequential(queries, fetch):
+    for query in queries:
+        fetch(query)
+
+
+def run_concurrent(queries, fetch):
+    for _ in fetch_concurrently(queries, fetch):
+        pass
+
+
+def measure(runner, queries, fetch):
+    samples = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        runner(queries, fetch)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), percentile(samples, 99)
+
+
+def main():
+    server, base_url = start_stub_server(latency=0.05)
+    client = SerpApiClient(rate=None)
+
+    def fetch(query):
+        return fetch_shopping_results(query, 'stub', base_url=base_url, client=client)
+
+    print(f"{'queries':>8} {'mode':>11} {'p50 ms':>9} {'p99 ms':>9}")
+    for count in QUERY_COUNTS:
+        queries = [f'query {i}' for i in range(count)]
+        for name, runner in [('sequential', run_sequential), ('concurrent', run_concurrent)]:
+            p50, p99 = measure(runner, queries, fetch)
+            print(f'{count:>8} {name:>11} {p50:>9.1f} {p99:>9.1f}')
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
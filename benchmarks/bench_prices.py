@@ -0,0 +1,90 @@
+"""Price parsing, filtering and summary stats over 100k synthetic results.
+
+Compares the original per-item regex approach (each price parsed once to
+filter and again for the summary) with a single ProductTable pass. Runs on
+listings drawn from a realistic pool of repeated prices and on a worst case
+where nearly every price string is distinct.
+
+Run from the repository root with: python -m benchmarks.bench_prices
+"""
+import random
+import time
+
+from prices import ProductTable
+
+ITEM_COUNT = 100_000
+MIN_PRICE = 25
+MAX_PRICE = 250
+
+
+def make_results(count, distinct=True):
+    rng = random.Random(310)
+    results = []
+    for i in range(count):
+        if i % 50 == 0:
+            price = "Price not available"
+        elif distinct:
+            price = f"${rng.randrange(100, 200000) / 100:,.2f}"
+        else:
+            price = f"${rng.randrange(1, 2000) - 0.01:,.2f}"
+        results.append({'title': f'Item {i}', 'price': price, 'source': 'Example Store'})
+    return results
+
+
+def legacy_extract_price_value(price_string):
+    if not price_string or price_string == "Price not available":
+        return None
+
+    import re
+    numbers = re.findall(r'[\d,]+\.?\d*', str(price_string).replace(',', ''))
+    if numbers:
+        try:
+            return float(numbers[0])
+        except ValueError:
+            return None
+    return None
+
+
+def legacy_pipeline(results):
+    filtered = []
+    for item in results:
+        value = legacy_extract_price_value(item.get("price", ""))
+        if value is not None and MIN_PRICE <= value <= MAX_PRICE:
+            filtered.append(item)
+    prices = [legacy_extract_price_value(item.get("price", "")) for item in filtered]
+    return filtered, min(prices), sum(prices) / len(prices), max(prices)
+
+
+def table_pipeline(results):
+    table = ProductTable.from_results(results).filter_by_price(MIN_PRICE, MAX_PRICE)
+    return (table.items, *table.price_stats())
+
+
+def timed(pipeline, results, rounds=5):
+    best = float('inf')
+    output = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        output = pipeline(results)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, output
+
+
+def main():
+    for label, distinct in [('repeated prices', False), ('distinct prices', True)]:
+        results = make_results(ITEM_COUNT, distinct)
+        legacy_ms, legacy_out = timed(legacy_pipeline, results)
+        table_ms, table_out = timed(table_pipeline, results)
+        assert len(legacy_out[0]) == len(table_out[0])
+
+        table = ProductTable.from_results(results)
+        refilter_ms, _ = timed(lambda _: table.filter_by_price(50, 100).price_stats(), results)
+
+        print(f'{ITEM_COUNT} items with {label}, {len(table_out[0])} in range')
+        print(f'  legacy regex per call : {legacy_ms:8.1f} ms')
+        print(f'  product table         : {table_ms:8.1f} ms ({legacy_ms / table_ms:.1f}x)')
+        print(f'  re-filter parsed table: {refilter_ms:8.1f} ms ({legacy_ms / refilter_ms:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
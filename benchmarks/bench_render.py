@@ -0,0 +1,177 @@
+"""Bytes of HTML sent to the frontend per rerun, before and after the shared card stylesheet.
+
+The "before" numbers replay the markup display_results used to emit: several
+st.markdown calls per card, each carrying its own inline styles and hover JS.
+A rerun renders up to three queries with MAX_DISPLAYED cards each.
+
+Run from the repository root with: python -m benchmarks.bench_render
+"""
+from rendering import CARD_STYLESHEET, iter_grid_batches
+
+QUERIES_PER_RERUN = 3
+CARD_COUNTS = [6, 24, 96]
+
+
+def make_items(count):
+    return [
+        {
+            'title': f'Vintage denim jacket #{i}',
+            'price': f'${20 + i:.2f}',
+            'thumbnail': f'https://encrypted-tbn0.gstatic.com/shopping?q=tbn:item{i}',
+            'link': f'https://www.example.com/products/vintage-denim-jacket-{i}',
+            'source': 'Example Store'
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_card_markdown(item):
+    """The per-card st.markdown payloads display_results emitted before rendering.py"""
+    out = []
+    out.append("""
+    <div style='
+        background: linear-gradient(135deg, #fff9c4 0%, #fce4ec 50%, #e8f5e8 100%);
+        padding: 20px;
+        border-radius: 15px;
+        box-shadow: 0 10px 30px rgba(255,182,193,0.3);
+        margin-bottom: 20px;
+        border: 2px solid #ffeb3b;
+    '>
+    """)
+
+    img = item.get("thumbnail")
+    if img:
+        out.append(f"""
+        <div style='text-align: center; margin-bottom: 15px;'>
+            <img src='{img}' style='
+                width: 100%;
+                max-width: 200px;
+                height: 200px;
+                object-fit: cover;
+                border-radius: 10px;
+                box-shadow: 0 5px 15px rgba(0,0,0,0.3);
+            ' />
+        </div>
+        """)
+    else:
+        out.append("""
+        <div style='
+            text-align: center;
+            padding: 60px 20px;
+            background: linear-gradient(135deg, #ffcccb, #ffe4e1);
+            border-radius: 10px;
+            margin-bottom: 15px;
+            color: #d32f2f;
+            border: 2px dashed #ff69b4;
+        '>
+            📷 No image available
+        </div>
+        """)
+
+    title = item.get("title", "No title")
+    out.append(f"""
+    <h4 style='
+        color: #2e7d32;
+        margin: 0 0 10px 0;
+        font-size: 16px;
+        line-height: 1.4;
+        text-align: center;
+        font-weight: 600;
+        text-shadow: 1px 1px 2px rgba(255,255,255,0.8);
+    '>{title}</h4>
+    """)
+
+    price = item.get("price", "Price not available")
+    out.append(f"""
+    <div style='
+        text-align: center;
+        margin-bottom: 15px;
+    '>
+        <span style='
+            background: linear-gradient(135deg, #ffeb3b, #ff9800);
+            color: #d84315;
+            padding: 8px 16px;
+            border-radius: 20px;
+            font-size: 18px;
+            font-weight: bold;
+            box-shadow: 0 3px 10px rgba(255,152,0,0.4);
+            border: 2px solid #ff6f00;
+        '>💰 {price}</span>
+    </div>
+    """)
+
+    link = item.get("link") or item.get("product_link") or item.get("serpapi_product_api")
+
+    source = item.get("source", "")
+
+    if link and link != "#":
+        out.append(f"""
+        <div style='text-align: center;'>
+            <a href='{link}' target='_blank' rel='noopener noreferrer' style='text-decoration: none;'>
+                <button style='
+                    background: linear-gradient(135deg, #ff6b9d, #ffa726);
+                    color: white;
+                    border: none;
+                    padding: 12px 24px;
+                    border-radius: 25px;
+                    cursor: pointer;
+                    font-size: 16px;
+                    font-weight: bold;
+                    transition: all 0.3s ease;
+                    box-shadow: 0 4px 15px rgba(255, 107, 157, 0.4);
+                    width: 100%;
+                ' onmouseover='this.style.transform="translateY(-2px)"; this.style.boxShadow="0 6px 20px rgba(255, 107, 157, 0.6)"' 
+                  onmouseout='this.style.transform="translateY(0px)"; this.style.boxShadow="0 4px 15px rgba(255, 107, 157, 0.4)"'>
+                    🛒 Buy at {source}
+                </button>
+            </a>
+        </div>
+        """)
+    else:
+        out.append("""
+        <div style='text-align: center;'>
+            <div style='
+                background: linear-gradient(135deg, #e0e0e0, #bdbdbd);
+                color: #666;
+                border: none;
+                padding: 12px 24px;
+                border-radius: 25px;
+                font-size: 16px;
+                width: 100%;
+                text-align: center;
+            '>
+                🔍 Search manually
+            </div>
+        </div>
+        """)
+
+    out.append("</div>")
+    return out
+
+
+def legacy_payload(items):
+    chunks = [chunk for item in items for chunk in legacy_card_markdown(item)]
+    return sum(len(chunk.encode()) for chunk in chunks), len(chunks)
+
+
+def current_payload(items):
+    chunks = list(iter_grid_batches(items))
+    return sum(len(chunk.encode()) for chunk in chunks), len(chunks)
+
+
+def main():
+    stylesheet_bytes = len(f'<style>{CARD_STYLESHEET}</style>'.encode())
+    print(f'shared stylesheet: {stylesheet_bytes} bytes, sent once per rerun')
+    print(f"{'cards/query':>12} {'before bytes':>13} {'elements':>9} {'after bytes':>12} {'elements':>9}")
+    for count in CARD_COUNTS:
+        items = make_items(count)
+        before, before_elements = legacy_payload(items)
+        after, after_elements = current_payload(items)
+        before *= QUERIES_PER_RERUN
+        after = after * QUERIES_PER_RERUN + stylesheet_bytes
+        print(f'{count:>12} {before:>13} {before_elements * QUERIES_PER_RERUN:>9} '
+              f'{after:>12} {after_elements * QUERIES_PER_RERUN + 1:>9}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Cold-start import cost and per-rerun time of the Streamlit app.
+
+Import times come from `python -X importtime` in fresh interpreters, so each
+sample is a true cold import. Rerun times drive main.py headlessly with
+streamlit.testing's AppTest against the offline SerpAPI mock: the first run,
+idle reruns before any search, the first submitted search, and reruns of that
+search (served from the session memo).
+
+Run from the repository root with: python -m benchmarks.bench_startup
+Exits non-zero when --max-shell-import-ms is set and importing main.py's
+startup modules takes longer.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'main.py')
+IMPORT_ROUNDS = 7
+RERUNS = 20
+# What main.py imports at startup (streamlit itself is already loaded by the server), and
+# what results_view pulls in on the first search.
+SHELL_MODULES = ('page_assets',)
+SEARCH_MODULES = ('requests', 'backends', 'dedupe', 'fetcher', 'image_cache', 'paginator', 'prices', 'search',
+                  'tracing', 'warmer')
+
+
+def import_times(modules, exclude=()):
+    """Cold import of `modules` in a fresh interpreter: (total ms, {top-level module: cumulative ms})"""
+    code = f"import {', '.join(modules)}" if modules else 'pass'
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            capture_output=True, text=True, check=True)
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        # Nested imports are indented under their parent; keep only modules imported directly.
+        if not name.startswith('  ', 1) and name.strip() not in exclude:
+            cumulative[name.strip()] = int(cumulative_us) / 1000
+    return sum(cumulative.values()), cumulative
+
+
+def report_imports(label, modules):
+    # Modules every interpreter loads at startup (site, encodings, ...) are not ours to optimize.
+    interpreter = set(import_times(())[1])
+    samples = [import_times(modules, interpreter) for _ in range(IMPORT_ROUNDS)]
+    totals = [total for total, _ in samples]
+    print(f'{label}: median {statistics.median(totals):.1f} ms over {IMPORT_ROUNDS} cold imports')
+    slowest = sorted(samples[0][1].items(), key=lambda entry: entry[1], reverse=True)[:5]
+    for name, ms in slowest:
+        print(f'  {name:<24} {ms:>8.1f} ms')
+    return statistics.median(totals)
+
+
+def time_run(app):
+    started = time.perf_counter()
+    app.run()
+    return (time.perf_counter() - started) * 1000
+
+
+def report_reruns():
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        print('reruns: skipped, streamlit is not installed')
+        return
+
+    from mock_serpapi import start_mock_server
+    server, base_url = start_mock_server(latency=0.05)
+    # Read by fetcher at import, which happens inside the first submitted run.
+    os.environ['SERPAPI_BASE_URL'] = base_url
+    os.environ['SERPAPI_API_KEY'] = 'mock'
+    # bench_fetch imports fetcher, which reads SERPAPI_BASE_URL once, so it must come after the mock is set.
+    from benchmarks.bench_fetch import percentile
+
+    app = AppTest.from_file(APP_PATH, default_timeout=60)
+    rows = [('first run', [time_run(app)])]
+    rows.append(('idle rerun', [time_run(app) for _ in range(RERUNS)]))
+
+    app.text_input(key='query_1').input('designer sneakers')
+    submit = next(button for button in app.button if button.label == '🚀 Start Sniping')
+    submit.click()
+    rows.append(('first search', [time_run(app)]))
+    rows.append(('search rerun', [time_run(app) for _ in range(RERUNS)]))
+    server.shutdown()
+
+    print(f"{'reruns':<14} {'p50 ms':>9} {'p95 ms':>9}")
+    for label, samples in rows:
+        print(f'{label:<14} {percentile(samples, 50):>9.1f} {percentile(samples, 95):>9.1f}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure cold-start imports and rerun time of the app.')
+    parser.add_argument('--max-shell-import-ms', type=float, help='fail when startup imports exceed this')
+    args = parser.parse_args(argv)
+
+    shell_ms = report_imports('startup imports (main.py shell)', SHELL_MODULES)
+    report_imports('deferred until first search', SEARCH_MODULES)
+    report_reruns()
+
+    if args.max_shell_import_ms is not None and shell_ms > args.max_shell_import_ms:
+        print(f'FAIL: startup imports above {args.max_shell_import_ms:.0f} ms', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""End-to-end load test: simulated Streamlit sessions against the offline SerpAPI mock.
+
+Each session runs what one submit of the search form does -- fetch every
+query's first page through the shared SearchService, then hand each page to
+results_view.display_query_results, the app's own code that pulls later pages
+until the price filter has enough matches and renders the card grid -- then
+re-filters with a second price range, which should be served from its page
+memo. Streamlit calls run in bare mode (no browser, output discarded), so
+the whole render path executes. Sessions share one SearchService, like
+st.cache_resource does for real users, but every run starts from empty
+caches in a temp directory.
+
+Run from the repository root with:
+    python -m benchmarks.loadtest --sessions 200 --concurrency 32 --latency 0.1
+    python -m benchmarks.loadtest --engines google_shopping,ebay,walmart --engine-latency walmart=2 --hedge-ms 500
+
+Exits non-zero when --max-p95-ms is set and the end-to-end p95 exceeds it.
+"""
+import argparse
+import random
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from os import path
+
+import requests
+from streamlit import config
+from streamlit.logger import set_log_level
+
+import results_view
+from benchmarks.bench_fetch import percentile
+from backends import build_search
+from cache import ResponseCache
+from client import SerpApiClient
+from dedupe import DuplicateFilter
+from image_cache import ImageCache
+from mock_serpapi import start_mock_server
+from price_history import PriceHistory
+from product_index import ProductIndex
+from search import SearchService
+from tracing import Trace, activate
+
+QUERIES = ['designer sneakers', 'vintage jacket', 'luxury handbag', 'wool coat', 'silk scarf', 'leather boots',
+           'denim skirt', 'cashmere sweater', 'linen shirt', 'trench coat', 'bucket hat', 'tote bag']
+PRICE_RANGES = [(0, 1000), (50, 300), (200, 800), (0, 150), (500, 1000)]
+DISPLAY_LIMIT = 6
+STAGES = ('search', 'filter', 'render', 'total')
+
+
+def make_service(base_url, directory, engines=('google_shopping',), hedge_deadline=None):
+    client = SerpApiClient(pool_size=64, rate=None)
+    return SearchService(
+        'mock',
+        upstream=build_search(engines, 'mock', base_url=base_url, client=client, hedge_deadline=hedge_deadline),
+        response_cache=ResponseCache(path=path.join(directory, 'responses.sqlite3')),
+        product_index=ProductIndex(path=path.join(directory, 'products.sqlite3')),
+        price_history=PriceHistory(path=path.join(directory, 'price_history.sqlite3')),
+    )
+
+
+def use_view_resources(service, directory):
+    """Point results_view's st.cache_resource getters at this run's service and a temp image cache"""
+    image_cache = ImageCache(root=path.join(directory, 'thumbs'), index_path=path.join(directory, 'thumbs.sqlite3'))
+    results_view.get_search_service = lambda: service
+    results_view.get_image_cache = lambda: image_cache
+    # Every Streamlit call outside `streamlit run` warns about the missing script context. The level has to
+    # go through config too, or parsing it on the first call resets the loggers to the default.
+    config.set_option('logger.level', 'error')
+    set_log_level('error')
+
+
+def run_session(service, rng):
+    """One user: submit 1-3 queries with a price range, then narrow the range and rerun"""
+    timings = dict.fromkeys(STAGES, 0.0)
+    memo = {}
+    queries = rng.sample(QUERIES, rng.randint(1, 3))
+    session_started = time.perf_counter()
+
+    for min_price, max_price in rng.sample(PRICE_RANGES, 2):
+        fetch_page = service.session_fetcher(memo, min_price if min_price > 0 else None,
+                                             max_price if max_price < 1000 else None)
+        with activate(Trace()) as trace:
+            started = time.perf_counter()
+            first_pages = {query: fetch_page(query) for query in queries}
+            timings['search'] += time.perf_counter() - started
+            duplicates = DuplicateFilter()
+            for query, first_page in first_pages.items():
+                results_view.display_query_results(query, first_page, min_price, max_price, fetch_page,
+                                                   DISPLAY_LIMIT, duplicates)
+        stages, _ = trace.breakdown()
+        timings['filter'] += stages['filter']['seconds']
+        timings['render'] += stages['render']['seconds']
+
+    # "search" is the first-page fetch alone; later pages are fetched lazily inside the view, and
+    # "filter" and "render" are the view's own spans.
+    timings['total'] = time.perf_counter() - session_started
+    return timings
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS.
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load-test search -> filter -> render against the SerpAPI mock.')
+    parser.add_argument('--sessions', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--latency', type=float, default=0.1, help='mean mock response delay in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0)
+    parser.add_argument('--engines', default='google_shopping', help='comma-separated backends to federate')
+    parser.add_argument('--engine-latency', action='append', default=[], metavar='ENGINE=SECONDS')
+    parser.add_argument('--hedge-ms', type=float, help='return federated pages after this deadline')
+    parser.add_argument('--seed', type=int, default=310)
+    parser.add_argument('--max-p95-ms', type=float, help='fail when end-to-end session p95 exceeds this')
+    args = parser.parse_args(argv)
+
+    engine_latency = {engine: float(seconds) for engine, seconds in
+                      (option.split('=', 1) for option in args.engine_latency)}
+    server, base_url = start_mock_server(latency=args.latency, error_rate=args.error_rate,
+                                         rate_limit_rate=args.rate_limit_rate, seed=args.seed,
+                                         engine_latency=engine_latency)
+    samples = {stage: [] for stage in STAGES}
+    failures = 0
+    with tempfile.TemporaryDirectory() as directory:
+        hedge_deadline = args.hedge_ms / 1000 if args.hedge_ms is not None else None
+        service = make_service(base_url, directory, args.engines.split(','), hedge_deadline)
+        use_view_resources(service, directory)
+        rngs = [random.Random(args.seed + i) for i in range(args.sessions)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            futures = [pool.submit(run_session, service, rng) for rng in rngs]
+            for future in futures:
+                try:
+                    timings = future.result()
+                except requests.exceptions.RequestException:
+                    failures += 1
+                    continue
+                for stage in STAGES:
+                    samples[stage].append(timings[stage] * 1000)
+        elapsed = time.perf_counter() - started
+        cache_stats = dict(service.response_cache.stats)
+        flight_stats = dict(service.single_flight.stats)
+    server.shutdown()
+
+    completed = len(samples['total'])
+    print(f'{completed} sessions in {elapsed:.1f}s ({completed / elapsed:.1f} sessions/s), '
+          f'{failures} failed, concurrency {args.concurrency}')
+    print(f"{'stage':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for stage in STAGES:
+        if samples[stage]:
+            print(f'{stage:>8} ' + ' '.join(f'{percentile(samples[stage], pct):>9.1f}' for pct in (50, 95, 99)))
+    print(f'peak RSS {peak_rss_mb():.1f} MB')
+    print(f"response cache: {cache_stats}; upstream calls {flight_stats['upstream_calls']}, "
+          f"coalesced {flight_stats['saved_calls']}")
+
+    if args.max_p95_ms is not None and samples['total'] and percentile(samples['total'], 95) > args.max_p95_ms:
+        print(f'FAIL: session p95 above {args.max_p95_ms:.0f} ms', file=sys.stderr)
+        return 1
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
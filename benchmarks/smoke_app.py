@@ -0,0 +1,67 @@
+"""Headless smoke run of the Streamlit app against the offline SerpAPI mock.
+
+Drives main.py with streamlit.testing's AppTest through the paths the
+benchmarks don't touch: the first page load, a submitted search rendered
+through results_view.display_results, the timing panel, the combined view and
+"load more". Fails if any run raises or a search renders no cards.
+
+Run from the repository root with: python -m benchmarks.smoke_app
+"""
+import os
+import sys
+
+from mock_serpapi import start_mock_server
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'main.py')
+CARD_MARKER = "class='snipe-card'"
+
+
+def card_count(app):
+    return sum(block.value.count(CARD_MARKER) for block in app.markdown)
+
+
+def check(app, step):
+    if app.exception:
+        raise SystemExit(f'{step}: {app.exception[0].message}')
+    print(f'{step}: ok, {card_count(app)} cards')
+
+
+def main():
+    from streamlit.testing.v1 import AppTest
+
+    server, base_url = start_mock_server(latency=0.01)
+    # Read by fetcher when results_view is first imported, inside the submitted run.
+    os.environ['SERPAPI_BASE_URL'] = base_url
+    os.environ['SERPAPI_API_KEY'] = 'mock'
+
+    app = AppTest.from_file(APP_PATH, default_timeout=60)
+    app.run()
+    check(app, 'first load')
+
+    app.text_input(key='query_1').input('designer sneakers')
+    app.text_input(key='query_2').input('vintage jacket')
+    next(button for button in app.button if button.label == '🚀 Start Sniping').click()
+    app.run()
+    check(app, 'search')
+    if not card_count(app):
+        raise SystemExit('search: no cards rendered')
+
+    app.checkbox(key='show_timing').check()
+    app.run()
+    check(app, 'timing panel')
+
+    next(button for button in app.button if button.label == '✨ Load more').click()
+    app.run()
+    check(app, 'load more')
+
+    app.checkbox(key='show_timing').uncheck()
+    app.checkbox(key='combined_view').check()
+    app.run()
+    check(app, 'combined view')
+
+    server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,46 @@
+"""Local stand-in for the SerpAPI search endpoint used by the benchmarks."""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def make_results(query, count=40):
+    return [
+        {
+            'title': f'{query} item {i}',
+            'price': f'${10 + i * 3.5:.2f}',
+            'thumbnail': f'https://example.com/{i}.jpg',
+            'link': f'https://example.com/p/{i}',
+            'source': 'Example Store'
+        }
+        for i in range(count)
+    ]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency = 0.05
+
+    def do_GET(self):
+        params = parse_qs(urlparse(self.path).query)
+        query = params.get('q', [''])[0]
+        time.sleep(self.latency)
+        body = json.dumps({'shopping_results': make_results(query)}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(latency=0.05, handler=StubHandler):
+    """Start a stub server on a free local port and return (server, base_url)"""
+    handler_class = type('ConfiguredHandler', (handler,), {'latency': latency})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler_class)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}/search.json'
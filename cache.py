@@ -0,0 +1,151 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'responses.sqlite3')
+MAX_MEMORY_ENTRIES = 256
+TTL_SECONDS = 60 * 60
+STALE_SECONDS = 24 * 60 * 60
+PURGE_EVERY = 500
+
+
+def make_cache_key(query, **params):
+    """Build a cache key from the normalized query and the engine parameters"""
+    normalized = ' '.join(str(query).lower().split())
+    extra = '&'.join(f'{name}={params[name]}' for name in sorted(params))
+    return f'{normalized}|{extra}'
+
+
+class ResponseCache:
+    """Two-tier TTL cache: a bounded in-process LRU in front of a SQLite store.
+
+    Entries older than ``ttl`` are still served for up to ``stale_ttl`` seconds
+    while a background thread refreshes them. The SQLite store may be shared
+    with other processes (warmer.py), so a stale memory entry is replaced by a
+    newer row on disk before it is served.
+    """
+
+    def __init__(self, path=CACHE_PATH, max_entries=MAX_MEMORY_ENTRIES, ttl=TTL_SECONDS, stale_ttl=STALE_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'evictions': 0, 'refreshes': 0}
+        self._memory = OrderedDict()
+        self._refreshing = set()
+        self._sets = 0
+        self._lock = threading.RLock()
+
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, stored_at REAL NOT NULL, value TEXT NOT NULL)'
+        )
+        self.purge()
+
+    def get(self, key):
+        """Return (value, stored_at) for a key that is not past its stale window, or None"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and time.time() - entry[1] > self.ttl:
+                entry = self._load(key, newer_than=entry[1]) or entry
+            if entry is not None:
+                self._memory.move_to_end(key)
+            else:
+                entry = self._load(key)
+                if entry is None:
+                    return None
+
+        if time.time() - entry[1] > self.ttl + self.stale_ttl:
+            return None
+        return entry
+
+    def set(self, key, value):
+        entry = (value, time.time())
+        with self._lock:
+            self._remember(key, entry)
+            self._db.execute(
+                'INSERT OR REPLACE INTO responses (key, stored_at, value) VALUES (?, ?, ?)',
+                (key, entry[1], json.dumps(value))
+            )
+            self._db.commit()
+            # The app keeps one cache for the life of the process, so expired rows are dropped as it goes.
+            self._sets += 1
+            if self._sets % PURGE_EVERY == 0:
+                self.purge()
+
+    def get_or_fetch(self, key, fetch, cacheable=None):
+        """Return the cached value for key, calling fetch() on a miss and refreshing stale entries in the background.
+
+        Fetched values for which cacheable(value) is false are returned without being stored.
+        """
+        entry = self.get(key)
+        if entry is None:
+            self._count('misses')
+            value = fetch()
+            if cacheable is None or cacheable(value):
+                self.set(key, value)
+            return value
+
+        value, stored_at = entry
+        if time.time() - stored_at <= self.ttl:
+            self._count('hits')
+        else:
+            self._count('stale_hits')
+            self._refresh_in_background(key, fetch, cacheable)
+        return value
+
+    def purge(self):
+        """Drop on-disk entries that are past their stale window"""
+        cutoff = time.time() - self.ttl - self.stale_ttl
+        with self._lock:
+            self._db.execute('DELETE FROM responses WHERE stored_at < ?', (cutoff,))
+            self._db.commit()
+
+    def _load(self, key, newer_than=None):
+        """Read a row from disk into the memory tier, unless it is no newer than `newer_than`"""
+        sql = 'SELECT value, stored_at FROM responses WHERE key = ?'
+        params = (key,)
+        if newer_than is not None:
+            sql += ' AND stored_at > ?'
+            params += (newer_than,)
+        row = self._db.execute(sql, params).fetchone()
+        if row is None:
+            return None
+        entry = (json.loads(row[0]), row[1])
+        self._remember(key, entry)
+        return entry
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _refresh_in_background(self, key, fetch, cacheable=None):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                value = fetch()
+                if cacheable is None or cacheable(value):
+                    self.set(key, value)
+                    self._count('refreshes')
+            except Exception:
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
@@ -0,0 +1,202 @@
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from tracing import span
+
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10
+POOL_SIZE = 16
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+RATE_PER_SECOND = 5
+BURST = 10
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised without touching the network while the circuit breaker is open"""
+
+
+class QuotaExceededError(requests.exceptions.RequestException):
+    """Raised without touching the network once a backend has used its call budget for the period"""
+
+
+class QuotaBudget:
+    """Allows at most `limit` calls per `period` seconds, counted in fixed windows"""
+
+    def __init__(self, limit, period=3600):
+        self.limit = limit
+        self.period = period
+        self.used = 0
+        self._window_start = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= self.period:
+                self._window_start = now
+                self.used = 0
+            if self.used >= self.limit:
+                return False
+            self.used += 1
+            return True
+
+
+class TokenBucket:
+    """Client-side rate limiter allowing `rate` requests per second with bursts up to `capacity`"""
+
+    def __init__(self, rate=RATE_PER_SECOND, capacity=BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures and lets one trial call through after `reset_timeout`"""
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self._failures = 0
+        self._opened_at = 0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == 'open' and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = 'half_open'
+                return True
+            return self.state == 'closed'
+
+    def record_success(self):
+        with self._lock:
+            self.state = 'closed'
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == 'half_open' or self._failures >= self.failure_threshold:
+                self.state = 'open'
+                self._opened_at = time.monotonic()
+
+
+class SerpApiClient:
+    """Shared keep-alive HTTP client with timeouts, jittered retries, rate limiting and a circuit breaker"""
+
+    def __init__(self, pool_size=POOL_SIZE, connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT,
+                 max_retries=MAX_RETRIES, rate=RATE_PER_SECOND, burst=BURST, breaker=None):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.limiter = TokenBucket(rate, burst) if rate else None
+        self.breaker = breaker or CircuitBreaker()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def get_json(self, url, params, decode=None, deadline=None):
+        """GET url and decode the JSON body, retrying 429/5xx responses and connection errors.
+
+        decode(body_bytes) replaces response.json() when given and must raise ValueError on
+        malformed input; that is re-raised as requests' InvalidJSONError without retrying.
+        With `deadline` (seconds) all attempts and backoff together stop within that budget.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(f'Circuit open, skipping request to {url}')
+
+        # Every call that got past allow() ends in exactly one outcome, or a half-open
+        # breaker would never let another request through.
+        outcome = self.breaker.record_failure
+        try:
+            data = self._get_json(url, params, decode, deadline)
+            outcome = self.breaker.record_success
+            return data
+        except requests.exceptions.HTTPError as e:
+            # A non-retryable 4xx means the upstream answered; it says nothing against its health.
+            status = e.response.status_code if e.response is not None else None
+            if status is not None and status < 500 and status not in RETRY_STATUSES:
+                outcome = self.breaker.record_success
+            raise
+        finally:
+            outcome()
+
+    def _get_json(self, url, params, decode, deadline):
+        expires = time.monotonic() + deadline if deadline else None
+        for attempt in range(self.max_retries + 1):
+            if self.limiter:
+                self.limiter.acquire()
+            timeout = self.timeout
+            if expires is not None:
+                remaining = expires - time.monotonic()
+                if remaining <= 0:
+                    raise requests.exceptions.Timeout(f'No time left for {url} within {deadline}s')
+                timeout = tuple(min(part, remaining) for part in timeout)
+            retry_after = None
+            try:
+                with span('fetch', attempt=attempt) as fetch_span:
+                    response = self.session.get(url, params=params, timeout=timeout)
+                    fetch_span.set(status=response.status_code, bytes=len(response.content))
+                if response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    with span('decode', bytes=len(response.content)):
+                        try:
+                            return decode(response.content) if decode else response.json()
+                        except ValueError as e:
+                            # Callers only handle RequestException; a garbled body counts against the breaker.
+                            raise requests.exceptions.InvalidJSONError(f'Invalid JSON from {url}: {e}',
+                                                                       response=response) from e
+                error = requests.exceptions.HTTPError(f'{response.status_code} Error for url: {url}', response=response)
+                retry_after = response.headers.get('Retry-After')
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error = e
+
+            if attempt < self.max_retries:
+                delay = backoff_delay(attempt, retry_after)
+                if expires is not None and time.monotonic() + delay >= expires:
+                    break
+                time.sleep(delay)
+        raise error
+
+
+def backoff_delay(attempt, retry_after=None):
+    """Full-jitter exponential backoff, honouring a numeric Retry-After header"""
+    if retry_after and retry_after.isdigit():
+        return min(BACKOFF_CAP, float(retry_after))
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client():
+    """Return the process-wide client, creating it on first use"""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = SerpApiClient()
+        return _default_client
@@ -0,0 +1,83 @@
+"""Decode SerpAPI shopping responses keeping only what the app reads.
+
+A google_shopping payload carries ads, filters, inline results and metadata
+next to `shopping_results`, and every result has a dozen fields we ignore.
+`decode_shopping_response` keeps just the result fields in RESULT_FIELDS and
+the pagination link, so cached pages hold a fraction of the raw payload.
+
+Bodies of STREAM_MIN_BYTES or more are parsed as an ijson event stream when
+ijson is installed, so the unused parts are never built as Python objects.
+That caps peak memory but costs about twice the decode time of orjson, so
+ordinary pages are decoded with orjson (or the stdlib) and projected after.
+"""
+import json
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+STREAM_MIN_BYTES = 1 << 20
+RESULT_FIELDS = ('title', 'price', 'thumbnail', 'link', 'product_link', 'serpapi_product_api', 'source')
+_ITEM_PREFIX = 'shopping_results.item'
+_FIELD_PREFIXES = {f'{_ITEM_PREFIX}.{field}': field for field in RESULT_FIELDS}
+_SCALAR_EVENTS = frozenset(('string', 'number', 'boolean', 'null'))
+
+
+def project_result(item):
+    return {field: item[field] for field in RESULT_FIELDS if field in item}
+
+
+def project_response(data):
+    """Reduce an already-decoded response to the same shape decode_shopping_response returns"""
+    projected = {'shopping_results': [project_result(item) for item in data.get('shopping_results') or ()]}
+    if 'serpapi_pagination' in data:
+        projected['serpapi_pagination'] = {'next': (data['serpapi_pagination'] or {}).get('next')}
+    if 'error' in data:
+        projected['error'] = data['error']
+    return projected
+
+
+def _decode_stream(body):
+    data = {}
+    results = None
+    item = None
+    for prefix, event, value in ijson.parse(body, use_float=True):
+        if prefix == _ITEM_PREFIX:
+            if event == 'start_map':
+                item = {}
+            elif event == 'end_map':
+                results.append(item)
+                item = None
+        elif item is not None:
+            field = _FIELD_PREFIXES.get(prefix)
+            if field is not None and event in _SCALAR_EVENTS:
+                item[field] = value
+        elif prefix == 'shopping_results' and event == 'start_array':
+            results = data['shopping_results'] = []
+        elif prefix == 'serpapi_pagination' and event == 'start_map':
+            data['serpapi_pagination'] = {'next': None}
+        elif prefix == 'serpapi_pagination.next' and event == 'string':
+            data['serpapi_pagination']['next'] = value
+        elif prefix == 'error' and event == 'string':
+            data['error'] = value
+    data.setdefault('shopping_results', [])
+    return data
+
+
+def decode_shopping_response(body):
+    """Decode a google_shopping response body (bytes) into {'shopping_results', ['serpapi_pagination']}.
+
+    Malformed bodies raise ValueError whichever parser ran.
+    """
+    if ijson is not None and len(body) >= STREAM_MIN_BYTES:
+        try:
+            return _decode_stream(body)
+        except ijson.JSONError as e:
+            raise ValueError(f'Malformed JSON: {e}') from e
+    return project_response(orjson.loads(body) if orjson is not None else json.loads(body))
@@ -0,0 +1,122 @@
+import random
+import zlib
+from collections import defaultdict
+
+from price_normalize import normalize_price
+from product_index import normalize_title, product_key
+
+NUM_PERMUTATIONS = 32
+BANDS = 8
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+SIMILARITY_THRESHOLD = 0.8
+PRICE_TOLERANCE = 0.05
+MAX_BUCKET_CHECKS = 8
+
+# XOR with a random 32-bit mask permutes crc32 values cheaply; one mask per MinHash "permutation".
+_rng = random.Random(310)
+_MASKS = [_rng.getrandbits(32) for _ in range(NUM_PERMUTATIONS)]
+
+
+def minhash(tokens):
+    """MinHash signature of a token set, so similar titles share band buckets"""
+    hashes = [zlib.crc32(token.encode()) for token in tokens]
+    return [min([h ^ mask for h in hashes]) for mask in _MASKS]
+
+
+class DuplicateFilter:
+    """Incrementally groups listings that are the same product.
+
+    Exact matches share a product key; near-duplicates have titles whose token
+    Jaccard similarity reaches `threshold` (candidates found through MinHash
+    LSH buckets) and prices within PRICE_TOLERANCE of each other. Each item is
+    hashed once and compared with at most MAX_BUCKET_CHECKS recent entries per
+    bucket, so a pass over n listings stays linear.
+    """
+
+    def __init__(self, threshold=SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self._keys = {}
+        self._buckets = defaultdict(list)
+        self._entries = []
+
+    def add(self, item):
+        """Record an item and return (group id, True if it is the first of its group)"""
+        key, tokens, price, bands, group = self._match(item)
+        if group is not None:
+            self._keys[key] = group
+            return group, False
+
+        group = len(self._entries)
+        self._entries.append((tokens, price))
+        self._keys[key] = group
+        for bucket in bands:
+            self._buckets[bucket].append(group)
+        return group, True
+
+    def seen(self, item):
+        """True if the item duplicates something added before; unlike add() it records nothing"""
+        return self._match(item)[4] is not None
+
+    def unique(self, items):
+        """Return the items that are not duplicates of anything added before"""
+        return [item for item in items if self.add(item)[1]]
+
+    def _match(self, item):
+        """(key, tokens, price, bands, group of an earlier duplicate or None)"""
+        key = product_key(item)
+        if key in self._keys:
+            return key, None, None, (), self._keys[key]
+
+        tokens = frozenset(normalize_title(item.get('title', '')).split())
+        price = normalize_price(item.get('price', '')).base_amount
+        bands = []
+        if tokens:
+            signature = minhash(tokens)
+            bands = [(band, tuple(signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]))
+                     for band in range(BANDS)]
+            checked = set()
+            for bucket in bands:
+                for group in self._buckets[bucket][-MAX_BUCKET_CHECKS:]:
+                    if group in checked:
+                        continue
+                    checked.add(group)
+                    if self._similar(tokens, price, group):
+                        return key, tokens, price, bands, group
+        return key, tokens, price, bands, None
+
+    def _similar(self, tokens, price, group):
+        other_tokens, other_price = self._entries[group]
+        if price is not None and other_price is not None:
+            if abs(price - other_price) > PRICE_TOLERANCE * max(price, other_price):
+                return False
+        return len(tokens & other_tokens) >= self.threshold * len(tokens | other_tokens)
+
+
+def combine_results(results_by_query, sort='relevance'):
+    """Merge every query's results into one deduplicated, ranked list.
+
+    sort is 'relevance' (best position a product reached in any query, then
+    how many queries returned it), 'price_low' or 'price_high'.
+    """
+    duplicates = DuplicateFilter()
+    groups = {}
+    for results in results_by_query.values():
+        for position, item in enumerate(results):
+            group, _ = duplicates.add(item)
+            if group in groups:
+                best, hits, first = groups[group]
+                groups[group] = (min(best, position), hits + 1, first)
+            else:
+                groups[group] = (position, 1, item)
+
+    ranked = list(groups.values())
+    if sort == 'relevance':
+        ranked.sort(key=lambda entry: (entry[0], -entry[1]))
+    else:
+        def price_key(entry):
+            price = normalize_price(entry[2].get('price', '')).base_amount
+            if price is None:
+                return (1, 0)
+            return (0, price if sort == 'price_low' else -price)
+        ranked.sort(key=price_key)
+    return [item for _, _, item in ranked]
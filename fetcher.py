@@ -0,0 +1,61 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+from client import get_default_client
+from decoding import decode_shopping_response
+from tracing import bind
+
+# Both can point at mock_serpapi.py for offline runs and load tests.
+BASE_URL = os.environ.get('SERPAPI_BASE_URL', 'https://serpapi.com/search.json')
+ENGINE = 'google_shopping'
+PAGE_SIZE = 40
+MAX_WORKERS = 8
+EMPTY_PAGE = {'results': [], 'has_next': False}
+
+
+def load_api_key():
+    """Read the SerpAPI key from SERPAPI_API_KEY, falling back to the local api_key module"""
+    key = os.environ.get('SERPAPI_API_KEY')
+    if key:
+        return key
+    from api_key import key1
+    return key1
+
+
+def fetch_shopping_page(query, api_key, start=0, num=PAGE_SIZE, base_url=BASE_URL, client=None, deadline=None):
+    """Fetch one page of google_shopping results as {'results': [...], 'has_next': bool}, within `deadline` seconds"""
+    params = {
+        'engine': ENGINE,
+        'q': query,
+        'start': start,
+        'num': num,
+        'api_key': api_key
+    }
+    data = (client or get_default_client()).get_json(base_url, params, decode=decode_shopping_response,
+                                                       deadline=deadline)
+    results = data.get('shopping_results', [])
+    pagination = data.get('serpapi_pagination') or {}
+    has_next = bool(pagination.get('next')) if 'serpapi_pagination' in data else len(results) >= num
+    return {'results': results, 'has_next': has_next}
+
+
+def fetch_shopping_results(query, api_key, base_url=BASE_URL, client=None):
+    """Fetch the first page of google_shopping results for one query, raising on request errors"""
+    return fetch_shopping_page(query, api_key, base_url=base_url, client=client)['results']
+
+
+def fetch_concurrently(queries, fetch, max_workers=MAX_WORKERS):
+    """Run fetch(query) for all queries at once and yield (query, result, error) as each one finishes"""
+    if not queries:
+        return
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(queries))) as pool:
+        futures = {pool.submit(bind(fetch), query): query for query in queries}
+        for future in as_completed(futures):
+            query = futures[future]
+            try:
+                yield query, future.result(), None
+            except requests.exceptions.RequestException as e:
+                yield query, None, e
@@ -0,0 +1,169 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from io import BytesIO
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+# Streamlit serves ./static at app/static when server.enableStaticServing is on.
+THUMB_DIR = os.path.join(APP_DIR, 'static', 'thumbs')
+THUMB_URL_PREFIX = 'app/static/thumbs'
+INDEX_PATH = os.path.join(APP_DIR, '.cache', 'thumbs.sqlite3')
+THUMB_SIZE = 200
+MAX_CACHE_BYTES = 200 * 1024 * 1024
+MAX_IMAGE_BYTES = 5 * 1024 * 1024
+MAX_DOWNLOADS = 4
+DOWNLOAD_TIMEOUT = (3.05, 5)
+WAIT_SECONDS = 1.5
+EXTENSIONS = {'image/jpeg': 'jpg', 'image/png': 'png', 'image/webp': 'webp', 'image/gif': 'gif'}
+
+
+class ImageCache:
+    """Downloads each thumbnail once, resizes it to the card size and stores it by content hash.
+
+    Files live under a statically served directory and are evicted least
+    recently used first once their total size passes ``max_bytes``.
+    """
+
+    def __init__(self, root=THUMB_DIR, index_path=INDEX_PATH, max_bytes=MAX_CACHE_BYTES,
+                 max_workers=MAX_DOWNLOADS, size=THUMB_SIZE):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.size = size
+        self.stats = {'hits': 0, 'downloads': 0, 'failures': 0, 'evictions': 0}
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._pending = {}
+        self._lock = threading.RLock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        os.makedirs(root, exist_ok=True)
+        if index_path != ':memory:':
+            os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        self._db = sqlite3.connect(index_path, check_same_thread=False)
+        self._db.executescript('''
+            CREATE TABLE IF NOT EXISTS files (name TEXT PRIMARY KEY, bytes INTEGER NOT NULL, last_access REAL NOT NULL);
+            CREATE TABLE IF NOT EXISTS urls (url TEXT PRIMARY KEY, name TEXT NOT NULL);
+            CREATE INDEX IF NOT EXISTS files_by_access ON files (last_access);
+        ''')
+
+    def lookup(self, url):
+        """Return the served URL for an already cached thumbnail, or None"""
+        with self._lock:
+            row = self._db.execute('SELECT name FROM urls WHERE url = ?', (url,)).fetchone()
+            if row is None or not os.path.exists(os.path.join(self.root, row[0])):
+                return None
+            self._db.execute('UPDATE files SET last_access = ? WHERE name = ?', (time.time(), row[0]))
+            self._db.commit()
+            self.stats['hits'] += 1
+            return f'{THUMB_URL_PREFIX}/{row[0]}'
+
+    def localize(self, urls, timeout=WAIT_SECONDS):
+        """Map each URL to its served thumbnail, waiting up to `timeout` for downloads.
+
+        URLs that are not ready in time are left out (callers fall back to the
+        original URL) and finish downloading in the background. With timeout=0
+        only already cached thumbnails are returned and the call never blocks.
+        """
+        local = {}
+        futures = {}
+        for url in dict.fromkeys(url for url in urls if url):
+            served = self.lookup(url)
+            if served:
+                local[url] = served
+            else:
+                futures[url] = self._schedule(url)
+
+        if futures and timeout:
+            wait(futures.values(), timeout=timeout)
+        for url, future in futures.items():
+            if future.done() and future.exception() is None and future.result():
+                local[url] = future.result()
+        return local
+
+    def _schedule(self, url):
+        with self._lock:
+            future = self._pending.get(url)
+            if future is None:
+                future = self._pending[url] = self._pool.submit(self._download, url)
+                future.add_done_callback(lambda _: self._forget(url))
+            return future
+
+    def _forget(self, url):
+        with self._lock:
+            self._pending.pop(url, None)
+
+    def _download(self, url):
+        try:
+            with self.session.get(url, timeout=DOWNLOAD_TIMEOUT, stream=True) as response:
+                response.raise_for_status()
+                content_type = response.headers.get('Content-Type', '').split(';')[0].strip()
+                if content_type not in EXTENSIONS:
+                    raise ValueError(f'Unsupported thumbnail type {content_type!r}')
+                data = response.raw.read(MAX_IMAGE_BYTES + 1, decode_content=True)
+            if len(data) > MAX_IMAGE_BYTES:
+                raise ValueError('Thumbnail too large')
+            data, extension = self._resize(data, EXTENSIONS[content_type])
+        except (requests.exceptions.RequestException, ValueError, OSError):
+            with self._lock:
+                self.stats['failures'] += 1
+            return None
+
+        name = f'{hashlib.sha256(data).hexdigest()}.{extension}'
+        path = os.path.join(self.root, name)
+        if not os.path.exists(path):
+            tmp_path = f'{path}.{threading.get_ident()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO files (name, bytes, last_access) VALUES (?, ?, ?)',
+                             (name, len(data), time.time()))
+            self._db.execute('INSERT OR REPLACE INTO urls (url, name) VALUES (?, ?)', (url, name))
+            self._db.commit()
+            self.stats['downloads'] += 1
+            self.evict()
+        return f'{THUMB_URL_PREFIX}/{name}'
+
+    def _resize(self, data, extension):
+        """Crop and scale to the square card size when Pillow is installed, otherwise keep the original"""
+        if Image is None:
+            return data, extension
+        with Image.open(BytesIO(data)) as img:
+            thumb = ImageOps.fit(img.convert('RGB'), (self.size, self.size))
+        out = BytesIO()
+        thumb.save(out, 'JPEG', quality=85, optimize=True)
+        return out.getvalue(), 'jpg'
+
+    def evict(self):
+        """Delete least recently used files until the cache fits in max_bytes"""
+        with self._lock:
+            total = self._db.execute('SELECT COALESCE(SUM(bytes), 0) FROM files').fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            for name, size in self._db.execute('SELECT name, bytes FROM files ORDER BY last_access').fetchall():
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(os.path.join(self.root, name))
+                except FileNotFoundError:
+                    pass
+                self._db.execute('DELETE FROM files WHERE name = ?', (name,))
+                self._db.execute('DELETE FROM urls WHERE name = ?', (name,))
+                total -= size
+                self.stats['evictions'] += 1
+            self._db.commit()
@@ -0,0 +1,229 @@
+"""Offline stand-in for SerpAPI's google_shopping, ebay and walmart engines.
+
+google_shopping serves recorded responses from fixtures/serpapi/<query-slug>.json
+and falls back to deterministic synthetic results for any other query; ebay and
+walmart always answer with synthetic results in their own response shapes.
+Latency (overall or per engine), error rate and 429 rate are configurable so
+the app, batch sweeps and load tests can be exercised without spending API
+quota:
+
+    python mock_serpapi.py --port 8765 --latency 0.2 --error-rate 0.02 --rate-limit-rate 0.05 --engine-latency ebay=1.5
+    SERPAPI_BASE_URL=http://127.0.0.1:8765/search.json SERPAPI_API_KEY=mock streamlit run main.py
+"""
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'serpapi')
+SYNTHETIC_RESULTS = 120
+ENGINE_PAGING = {
+    # engine: (query parameter, page parameter or None for start/num, results key)
+    'google_shopping': ('q', None, 'shopping_results'),
+    'ebay': ('_nkw', '_pgn', 'organic_results'),
+    'walmart': ('query', 'page', 'organic_results'),
+}
+PAGE_SIZE = 40
+SOURCES = ('Nordstrom', 'SSENSE', 'Farfetch', 'eBay', 'Grailed', 'Zappos', 'END. Clothing', 'Mytheresa')
+
+
+def fixture_slug(query):
+    return re.sub(r'[^a-z0-9]+', '-', query.lower()).strip('-')
+
+
+def load_fixtures(directory=FIXTURES_DIR):
+    """Map query slug -> recorded shopping_results for every fixture file in `directory`"""
+    fixtures = {}
+    if os.path.isdir(directory):
+        for name in sorted(os.listdir(directory)):
+            if name.endswith('.json'):
+                with open(os.path.join(directory, name), encoding='utf-8') as f:
+                    fixtures[name[:-len('.json')]] = json.load(f)['shopping_results']
+    return fixtures
+
+
+def synthetic_results(query, count=SYNTHETIC_RESULTS):
+    """Deterministic, realistic-looking listings for queries without a fixture"""
+    rng = random.Random(fixture_slug(query))
+    slug = fixture_slug(query)
+    results = []
+    for i in range(count):
+        source = rng.choice(SOURCES)
+        price = round(rng.uniform(15, 900), 2)
+        results.append({
+            'position': i + 1,
+            'title': f'{query.title()} {rng.choice(("Classic", "Oversized", "Slim", "Vintage", "Limited"))} {i}',
+            'link': f'https://shop.example.com/{slug}/{i}',
+            'product_link': f'https://www.google.com/shopping/product/{rng.getrandbits(48)}',
+            'source': source,
+            'price': f'${price:,.2f}',
+            'extracted_price': price,
+            'rating': round(rng.uniform(3, 5), 1),
+            'reviews': rng.randint(0, 4000),
+            'thumbnail': f'https://images.example.com/{slug}/{i}.jpg',
+            'delivery': rng.choice(('Free delivery', '$5.99 delivery', 'Free by Fri')),
+        })
+    return results
+
+
+def ebay_item(item):
+    price = item['extracted_price']
+    return {
+        'position': item['position'],
+        'title': item['title'],
+        'link': item['link'].replace('shop.example.com', 'www.ebay.com/itm'),
+        'condition': 'Pre-Owned' if item['position'] % 3 else 'Brand New',
+        'price': {'raw': f'${price:,.2f}', 'extracted': price},
+        'shipping': item['delivery'],
+        'thumbnail': item['thumbnail'],
+    }
+
+
+def walmart_item(item):
+    return {
+        'position': item['position'],
+        'title': item['title'],
+        'product_page_url': item['link'].replace('shop.example.com', 'www.walmart.com/ip'),
+        'seller_name': 'Walmart.com',
+        'rating': item['rating'],
+        'primary_offer': {'offer_price': item['extracted_price'], 'currency': 'USD'},
+        'thumbnail': item['thumbnail'],
+    }
+
+
+ENGINE_ITEMS = {'ebay': ebay_item, 'walmart': walmart_item}
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    engine_latency = {}
+    error_rate = 0.0
+    rate_limit_rate = 0.0
+    retry_after = 1
+    fixtures = {}
+    rng = random.Random()
+    # ThreadingHTTPServer handles requests concurrently; random.Random is not safe to share unlocked.
+    rng_lock = threading.Lock()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {name: values[0] for name, values in parse_qs(url.query).items()}
+        engine = params.get('engine', 'google_shopping')
+        with self.rng_lock:
+            roll = self.rng.random()
+            delay = self.engine_latency.get(engine, self.latency) * self.rng.uniform(0.5, 1.5)
+        time.sleep(delay)
+
+        if roll < self.rate_limit_rate:
+            self.send_json(429, {'error': 'Rate limit exceeded.'}, {'Retry-After': str(self.retry_after)})
+        elif roll < self.rate_limit_rate + self.error_rate:
+            self.send_json(503, {'error': 'Upstream temporarily unavailable.'})
+        elif engine not in ENGINE_PAGING:
+            self.send_json(400, {'error': f'Unsupported engine: {engine}'})
+        elif not params.get('api_key'):
+            self.send_json(401, {'error': 'Invalid API key.'})
+        else:
+            self.send_json(200, self.search(url.path, engine, params))
+
+    def search(self, path, engine, params):
+        query_param, page_param, results_key = ENGINE_PAGING[engine]
+        query = params.get(query_param, '')
+        if page_param is None:
+            start = int(params.get('start', 0))
+            num = int(params.get('num', PAGE_SIZE))
+        else:
+            num = int(params.get('_ipg', PAGE_SIZE))
+            start = (int(params.get(page_param, 1)) - 1) * num
+
+        if engine == 'google_shopping':
+            results = self.fixtures.get(fixture_slug(query)) or synthetic_results(query)
+        else:
+            # Seeded by engine too, so each marketplace lists different products.
+            results = [ENGINE_ITEMS[engine](item) for item in synthetic_results(f'{query} {engine}')]
+        page = results[start:start + num]
+        body = {
+            'search_metadata': {'status': 'Success', 'engine': engine, 'mock': True},
+            'search_parameters': dict(params, api_key=None),
+            'search_information': {'shopping_results_state': 'Results for exact spelling'},
+            results_key: page,
+        }
+        if start + num < len(results):
+            if page_param is None:
+                next_params = dict(params, start=start + num)
+            else:
+                next_params = dict(params, **{page_param: start // num + 2})
+            next_params.pop('api_key', None)
+            host = self.headers.get('Host', 'localhost')
+            body['serpapi_pagination'] = {'next': f'http://{host}{path}?{urlencode(next_params)}'}
+        return body
+
+    def send_json(self, status, body, headers=None):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host='127.0.0.1', port=0, latency=0.0, error_rate=0.0, rate_limit_rate=0.0, seed=None,
+                fixtures_dir=FIXTURES_DIR, engine_latency=None):
+    handler = type('ConfiguredMockHandler', (MockHandler,), {
+        'latency': latency,
+        'engine_latency': dict(engine_latency or {}),
+        'error_rate': error_rate,
+        'rate_limit_rate': rate_limit_rate,
+        'fixtures': load_fixtures(fixtures_dir),
+        'rng': random.Random(seed),
+        'rng_lock': threading.Lock(),
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server, f'http://{host}:{server.server_port}/search.json'
+
+
+def start_mock_server(**options):
+    """Serve the mock on a background thread and return (server, base_url); see make_server for options"""
+    server, base_url = make_server(**options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, base_url
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve a local mock of the SerpAPI google_shopping endpoint.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='mean response delay in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with 503')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='fraction answered with 429')
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--fixtures', default=FIXTURES_DIR)
+    parser.add_argument('--engine-latency', action='append', default=[], metavar='ENGINE=SECONDS',
+                        help='override --latency for one engine; repeatable')
+    args = parser.parse_args(argv)
+
+    engine_latency = {engine: float(seconds) for engine, seconds in
+                      (option.split('=', 1) for option in args.engine_latency)}
+    server, base_url = make_server(args.host, args.port, args.latency, args.error_rate, args.rate_limit_rate,
+                                   args.seed, args.fixtures, engine_latency)
+    print(f'Mock SerpAPI listening on {base_url}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
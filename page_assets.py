@@ -0,0 +1,131 @@
+"""Static page chrome: the app stylesheet, header and footer."""
+import re
+
+from rendering import CARD_STYLESHEET
+
+APP_STYLESHEET = """.main > div {
+    padding-top: 2rem;
+}
+
+.stApp {
+    background: linear-gradient(135deg, #fff9c4 0%, #fce4ec 25%, #e8f5e8 50%, #fff3e0 75%, #f3e5f5 100%);
+    min-height: 100vh;
+}
+
+.search-header {
+    text-align: center;
+    padding: 40px 20px;
+    background: linear-gradient(135deg, #fff9c4, #fce4ec);
+    border-radius: 20px;
+    margin-bottom: 30px;
+    border: 3px solid #ffeb3b;
+    box-shadow: 0 8px 25px rgba(255,235,59,0.3);
+}
+
+.search-form {
+    background: linear-gradient(135deg, #e8f5e8, #fff3e0);
+    padding: 30px;
+    border-radius: 15px;
+    border: 2px solid #4caf50;
+    margin-bottom: 30px;
+    box-shadow: 0 5px 20px rgba(76,175,80,0.2);
+}
+
+.stTextInput > div > div > input {
+    background: linear-gradient(135deg, #fff9c4, #ffffff);
+    border: 2px solid #ff69b4;
+    border-radius: 10px;
+    color: #2e7d32;
+    padding: 12px;
+    font-weight: 500;
+}
+
+.stTextInput > div > div > input::placeholder {
+    color: #81c784;
+    font-style: italic;
+}
+
+.stButton > button {
+    background: linear-gradient(135deg, #ff6b9d, #ffa726, #66bb6a);
+    color: white;
+    border: none;
+    border-radius: 25px;
+    padding: 15px 30px;
+    font-size: 18px;
+    font-weight: bold;
+    transition: all 0.3s ease;
+    box-shadow: 0 5px 20px rgba(255,107,157,0.4);
+    width: 100%;
+    text-shadow: 1px 1px 2px rgba(0,0,0,0.3);
+}
+
+.stButton > button:hover {
+    transform: translateY(-2px);
+    box-shadow: 0 8px 25px rgba(255,107,157,0.6);
+}
+
+.results-header {
+    background: linear-gradient(135deg, #fce4ec, #fff3e0);
+    padding: 20px;
+    border-radius: 15px;
+    margin: 20px 0;
+    border: 2px solid #ff69b4;
+    box-shadow: 0 5px 15px rgba(255,105,180,0.3);
+}
+"""
+
+HEADER_HTML = """
+<div class='search-header'>
+    <h1 style='
+        font-size: 48px;
+        margin: 0;
+        background: linear-gradient(135deg, #ff6b9d, #ffa726, #66bb6a);
+        -webkit-background-clip: text;
+        -webkit-text-fill-color: transparent;
+        background-clip: text;
+        text-shadow: 2px 2px 4px rgba(0,0,0,0.1);
+    '>🎯 SnipeStyle</h1>
+    <p style='
+        font-size: 20px;
+        color: #2e7d32;
+        margin: 10px 0 0 0;
+        font-weight: 600;
+        text-shadow: 1px 1px 2px rgba(255,255,255,0.8);
+    '>Discover and snipe the hottest fashion trends instantly</p>
+    <div style='
+        width: 60px;
+        height: 4px;
+        background: linear-gradient(135deg, #ff6b9d, #ffa726);
+        margin: 20px auto;
+        border-radius: 2px;
+    '></div>
+</div>
+"""
+
+FOOTER_HTML = """
+<div style='
+    text-align: center;
+    margin-top: 50px;
+    padding: 20px;
+    color: #2e7d32;
+    border-top: 3px solid #ff69b4;
+    background: linear-gradient(135deg, #fff9c4, #fce4ec);
+    border-radius: 15px;
+'>
+    <p style='font-weight: 600; text-shadow: 1px 1px 2px rgba(255,255,255,0.8);'>Made with ❤️ for fashion enthusiasts | Powered by SerpAPI</p>
+</div>
+"""
+
+
+def minify_css(css):
+    return re.sub(r'\s*([{};,>])\s*', r'\1', re.sub(r'\s+', ' ', css)).strip()
+
+
+def minify_html(html):
+    return re.sub(r'>\s+<', '><', re.sub(r'\s+', ' ', html)).strip()
+
+
+# Built once per process: Streamlit re-executes main.py on every rerun, but imported
+# modules stay loaded. Each is sent as a single one-line markdown block.
+PAGE_HEAD = f"<style>{minify_css(APP_STYLESHEET + CARD_STYLESHEET)}</style>{minify_html(HEADER_HTML)}"
+PAGE_FOOT = minify_html(FOOTER_HTML)
@@ -0,0 +1,41 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from fetcher import PAGE_SIZE
+from prices import ProductTable
+from tracing import bind
+
+MAX_PAGES = 5
+
+
+def iter_pages(fetch_page, start=0, page_size=PAGE_SIZE, max_pages=MAX_PAGES):
+    """Lazily yield pages from fetch_page(start), fetching the next page in the background.
+
+    fetch_page must return {'results': [...], 'has_next': bool}. Closing the
+    generator early abandons any prefetch that is still in flight.
+    """
+    pool = ThreadPoolExecutor(max_workers=1)
+    try:
+        pending = pool.submit(bind(fetch_page), start)
+        for page_number in range(max_pages):
+            page = pending.result()
+            start += page_size
+            if page['has_next'] and page['results'] and page_number + 1 < max_pages:
+                pending = pool.submit(bind(fetch_page), start)
+            else:
+                pending = None
+            yield page
+            if pending is None:
+                return
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_in_price_range(pages, min_price=None, max_price=None, wanted=None):
+    """Yield (page, ProductTable of its in-range items) per page until `wanted` items have matched"""
+    matched = 0
+    for page in pages:
+        table = ProductTable.from_results(page['results']).filter_by_price(min_price, max_price)
+        matched += len(table)
+        yield page, table
+        if wanted is not None and matched >= wanted:
+            return
@@ -0,0 +1,137 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from statistics import median
+
+from price_normalize import normalize_price
+from product_index import product_key
+
+HISTORY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'price_history.sqlite3')
+WINDOW = 32
+RETENTION_SECONDS = 90 * 24 * 60 * 60
+MAX_OBSERVATIONS = 500_000
+COMPACT_EVERY = 5_000
+DEAL_RATIO = 0.75
+MIN_OBSERVATIONS = 3
+
+
+class PriceHistory:
+    """Append-only log of (product, price, source, timestamp) observations.
+
+    Alongside the log, each product keeps its last WINDOW prices so rolling
+    min/median are updated incrementally on every append and deal checks are a
+    single row lookup plus a median over a fixed-size window. Windows live only
+    in SQLite and are rolled forward inside one write transaction, so the app
+    and warmer.py can record into the same file. The log is trimmed by age and
+    row count so it stays bounded on disk.
+    """
+
+    def __init__(self, path=HISTORY_PATH, window=WINDOW, retention=RETENTION_SECONDS, max_rows=MAX_OBSERVATIONS):
+        self.window = window
+        self.retention = retention
+        self.max_rows = max_rows
+        self._ids = {}
+        self._appended = 0
+        self._lock = threading.Lock()
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        self._db.executescript('''
+            CREATE TABLE IF NOT EXISTS products (id INTEGER PRIMARY KEY, key TEXT UNIQUE NOT NULL);
+            CREATE TABLE IF NOT EXISTS observations (
+                product INTEGER NOT NULL, price REAL NOT NULL, source TEXT, ts INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS windows (
+                product INTEGER PRIMARY KEY, prices TEXT NOT NULL, updated INTEGER NOT NULL
+            );
+        ''')
+
+    def record(self, results, now=None):
+        """Append one observation per priced listing and roll each product's window forward"""
+        ts = int(now if now is not None else time.time())
+        with self._lock:
+            # Take the write lock before reading windows so another process can't roll them forward in between;
+            # the connection context manager commits, or rolls back on error.
+            self._db.execute('BEGIN IMMEDIATE')
+            with self._db:
+                rows = []
+                for item in results:
+                    price = normalize_price(item.get('price', '')).base_amount
+                    if price is None:
+                        continue
+                    product = self._product_id(product_key(item))
+                    prices = self._load_window(product)
+                    prices.append(price)
+                    rows.append((product, price, item.get('source'), ts))
+                    self._db.execute('INSERT OR REPLACE INTO windows (product, prices, updated) VALUES (?, ?, ?)',
+                                     (product, json.dumps(list(prices)), ts))
+                self._db.executemany('INSERT INTO observations (product, price, source, ts) VALUES (?, ?, ?, ?)', rows)
+            self._appended += len(rows)
+            if self._appended >= COMPACT_EVERY:
+                self._appended = 0
+                self._compact(ts)
+
+    def summary(self, item):
+        """Return (rolling min, rolling median, observations in window) for a listing's product, or None"""
+        with self._lock:
+            product = self._lookup_id(product_key(item))
+            if product is None:
+                return None
+            prices = self._load_window(product)
+        if not prices:
+            return None
+        return min(prices), median(prices), len(prices)
+
+    def deal_discount(self, item, ratio=DEAL_RATIO, min_observations=MIN_OBSERVATIONS):
+        """Return how far below its rolling median a listing is priced (0.3 = 30%) if that makes it a deal"""
+        price = normalize_price(item.get('price', '')).base_amount
+        stats = self.summary(item) if price is not None else None
+        if stats is None:
+            return None
+        _, typical, count = stats
+        if count < min_observations or typical <= 0 or price > ratio * typical:
+            return None
+        return 1 - price / typical
+
+    def compact(self):
+        with self._lock:
+            self._compact(int(time.time()))
+
+    def _compact(self, now):
+        cutoff = now - self.retention
+        self._db.execute('DELETE FROM observations WHERE ts < ?', (cutoff,))
+        self._db.execute('''
+            DELETE FROM observations WHERE rowid <= (
+                SELECT rowid FROM observations ORDER BY rowid DESC LIMIT 1 OFFSET ?
+            )
+        ''', (self.max_rows,))
+        stale = [row[0] for row in self._db.execute('SELECT product FROM windows WHERE updated < ?', (cutoff,))]
+        self._db.executemany('DELETE FROM windows WHERE product = ?', [(product,) for product in stale])
+        self._db.executemany('DELETE FROM products WHERE id = ?', [(product,) for product in stale])
+        if stale:
+            stale = set(stale)
+            self._ids = {key: product for key, product in self._ids.items() if product not in stale}
+        self._db.commit()
+        self._db.execute('PRAGMA incremental_vacuum')
+
+    def _lookup_id(self, key):
+        product = self._ids.get(key)
+        if product is None:
+            row = self._db.execute('SELECT id FROM products WHERE key = ?', (key,)).fetchone()
+            if row is not None:
+                product = self._ids[key] = row[0]
+        return product
+
+    def _product_id(self, key):
+        product = self._lookup_id(key)
+        if product is None:
+            product = self._ids[key] = self._db.execute('INSERT INTO products (key) VALUES (?)', (key,)).lastrowid
+        return product
+
+    def _load_window(self, product):
+        row = self._db.execute('SELECT prices FROM windows WHERE product = ?', (product,)).fetchone()
+        return deque(json.loads(row[0]) if row else [], maxlen=self.window)
@@ -0,0 +1,118 @@
+import json
+import os
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+FX_RATES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fx_rates.json')
+BASE_CURRENCY = 'USD'
+
+# Longest tokens first so "US$" and "CA$" win over a bare "$".
+CURRENCY_TOKENS = {
+    'US$': 'USD', 'CA$': 'CAD', 'C$': 'CAD', 'AU$': 'AUD', 'A$': 'AUD', 'NZ$': 'NZD', 'HK$': 'HKD',
+    'R$': 'BRL', '$': 'USD', '€': 'EUR', '£': 'GBP', '¥': 'JPY', '₹': 'INR', '₩': 'KRW',
+    'USD': 'USD', 'CAD': 'CAD', 'AUD': 'AUD', 'NZD': 'NZD', 'HKD': 'HKD', 'BRL': 'BRL', 'EUR': 'EUR',
+    'GBP': 'GBP', 'JPY': 'JPY', 'INR': 'INR', 'KRW': 'KRW', 'CHF': 'CHF', 'MXN': 'MXN',
+}
+CURRENCY_PATTERN = re.compile('|'.join(re.escape(token) for token in sorted(CURRENCY_TOKENS, key=len, reverse=True)))
+
+# Number formats by locale: (thousands separators, decimal separator, full-match pattern).
+LOCALE_FORMATS = {
+    'en': (',', '.', re.compile(r'\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?')),
+    'de': ('.', ',', re.compile(r'\d{1,3}(?:\.\d{3})+(?:,\d+)?|\d+(?:,\d+)?')),
+    'fr': (' \u00a0\u202f', ',', re.compile(r'\d{1,3}(?:[ \u00a0\u202f]\d{3})+(?:,\d+)?|\d+(?:,\d+)?')),
+    'ch': ("'", '.', re.compile(r"\d{1,3}(?:'\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?")),
+}
+CURRENCY_LOCALES = {'EUR': 'de', 'BRL': 'de', 'CHF': 'ch'}
+EN_NUMBER = LOCALE_FORMATS['en'][2]
+
+NUMBER_PATTERN = re.compile(r"\d(?:[\d.,'\u00a0\u202f]|\s(?=\d{3}\b))*")
+RANGE_PATTERN = re.compile(r'\d\D{0,6}?(?:[-–—]|\bto\b)\D{0,6}?\d', re.IGNORECASE)
+FROM_PATTERN = re.compile(r'\b(?:from|starting at|starts at|as low as)\b', re.IGNORECASE)
+PER_UNIT_PATTERN = re.compile(r'(?:\bper\b|/\s*(?:ea|each|unit|mo|month|pc|pair)\b|\beach\b|\bea\.?$)', re.IGNORECASE)
+
+NormalizedPrice = namedtuple('NormalizedPrice', ['amount', 'currency', 'base_amount', 'high', 'kind'])
+NormalizedPrice.__doc__ = """A parsed price.
+
+amount/high are in the listing's currency (high is only set for ranges),
+base_amount is amount converted to BASE_CURRENCY, and kind is one of
+'exact', 'range', 'from' or 'per_unit'.
+"""
+UNPARSED = NormalizedPrice(None, None, None, None, None)
+
+
+@lru_cache(maxsize=1)
+def load_fx_rates(path=FX_RATES_PATH):
+    """Load {currency: units of BASE_CURRENCY per unit} from the local FX table"""
+    with open(path, encoding='utf-8') as f:
+        table = json.load(f)
+    rates = dict(table['rates'])
+    rates[table['base']] = 1.0
+    return rates
+
+
+def to_base_currency(amount, currency):
+    if amount is None:
+        return None
+    rate = load_fx_rates().get(currency or BASE_CURRENCY)
+    return amount * rate if rate is not None else None
+
+
+def detect_currency(price_string):
+    """Return the ISO code for the first currency token in a price string, if any"""
+    match = CURRENCY_PATTERN.search(str(price_string or ''))
+    return CURRENCY_TOKENS[match.group()] if match else None
+
+
+def parse_number(token, locale=None):
+    """Turn a number token such as '1.299,00' or "1'299.50" into a float, preferring the given locale"""
+    token = token.strip().rstrip('.,\'')
+    order = [locale] if locale else []
+    order += [name for name in LOCALE_FORMATS if name != locale]
+    for name in order:
+        thousands, decimal, pattern = LOCALE_FORMATS[name]
+        if pattern.fullmatch(token):
+            for separator in thousands:
+                token = token.replace(separator, '')
+            return float(token.replace(decimal, '.'))
+    return float(re.sub(r'\D', '', token))
+
+
+@lru_cache(maxsize=4096)
+def normalize_price(price_string):
+    """Parse a listing price into a NormalizedPrice, memoized per distinct string"""
+    if not price_string or price_string == "Price not available":
+        return UNPARSED
+
+    text = str(price_string)
+    currency = 'USD' if text[0] == '$' else None
+    digits = text[1:] if currency else text
+    # Fast path for plain "$1,299.00"-style prices; commas must be thousands separators, so "12,50" falls through.
+    if digits[:1].isdecimal() and (digits.replace('.', '', 1).isdecimal() if ',' not in digits
+                                   else EN_NUMBER.fullmatch(digits)):
+        amount = float(digits.replace(',', ''))
+        return NormalizedPrice(amount, currency, to_base_currency(amount, currency), None, 'exact')
+
+    match = CURRENCY_PATTERN.search(text)
+    currency = CURRENCY_TOKENS[match.group()] if match else None
+    start = 0
+    if match and text[match.end():].lstrip()[:1].isdigit():
+        # "2 for $20": the amount is the number after a prefix currency.
+        start = match.start()
+    locale = CURRENCY_LOCALES.get(currency)
+    numbers = [parse_number(token, locale) for token in NUMBER_PATTERN.findall(text, start)]
+    if not numbers:
+        return NormalizedPrice(None, currency, None, None, None)
+
+    amount = numbers[0]
+    high = None
+    if len(numbers) > 1 and RANGE_PATTERN.search(text):
+        kind = 'range'
+        high = numbers[1]
+    elif FROM_PATTERN.search(text):
+        kind = 'from'
+    elif PER_UNIT_PATTERN.search(text):
+        kind = 'per_unit'
+    else:
+        kind = 'exact'
+    return NormalizedPrice(amount, currency, to_base_currency(amount, currency), high, kind)
@@ -0,0 +1,91 @@
+import math
+from array import array
+from itertools import compress
+
+from price_normalize import normalize_price
+from tracing import span
+
+MISSING = math.nan
+
+
+class ProductTable:
+    """Columnar view of one result set with every price parsed exactly once.
+
+    Prices are converted to the base currency and kept in a float array (NaN
+    when unparseable) alongside currency and source columns, so filtering and
+    summary stats are single passes over a column instead of re-parsing each
+    item's price string.
+    """
+
+    __slots__ = ('items', 'prices', 'currencies', 'sources')
+
+    def __init__(self, items, prices, currencies, sources):
+        self.items = items
+        self.prices = prices
+        self.currencies = currencies
+        self.sources = sources
+
+    @classmethod
+    def from_results(cls, results):
+        items = list(results)
+        prices = array('d')
+        currencies = []
+        with span("parse", items=len(items)):
+            for item in items:
+                price = normalize_price(item.get("price", ""))
+                prices.append(MISSING if price.base_amount is None else price.base_amount)
+                currencies.append(price.currency)
+            sources = [item.get("source", "") for item in items]
+        return cls(items, prices, currencies, sources)
+
+    @classmethod
+    def concat(cls, tables):
+        """Stack several tables into one without re-parsing"""
+        tables = list(tables)
+        prices = array('d')
+        for table in tables:
+            prices.extend(table.prices)
+        return cls(
+            [item for table in tables for item in table.items],
+            prices,
+            [currency for table in tables for currency in table.currencies],
+            [source for table in tables for source in table.sources]
+        )
+
+    def __len__(self):
+        return len(self.items)
+
+    def select(self, mask):
+        """Return a new table holding the rows where mask is true"""
+        mask = list(mask)
+        return ProductTable(
+            list(compress(self.items, mask)),
+            array('d', compress(self.prices, mask)),
+            list(compress(self.currencies, mask)),
+            list(compress(self.sources, mask))
+        )
+
+    def filter_by_price(self, min_price=None, max_price=None):
+        """Keep rows inside the price range; rows without a price are dropped once any bound is set"""
+        if not min_price and not max_price:
+            return self
+        low = min_price or -math.inf
+        high = max_price or math.inf
+        with span("filter", items=len(self.items)) as filter_span:
+            table = self.select(low <= price <= high for price in self.prices)
+            filter_span.set(matched=len(table))
+        return table
+
+    def price_stats(self):
+        """Return (min, avg, max) over the parsed prices, or None if nothing parsed"""
+        known = [price for price in self.prices if price == price]
+        if not known:
+            return None
+        return min(known), math.fsum(known) / len(known), max(known)
+
+
+def filter_results_by_price(results, min_price=None, max_price=None):
+    """Filter results based on price range"""
+    if not min_price and not max_price:
+        return results
+    return ProductTable.from_results(results).filter_by_price(min_price, max_price).items
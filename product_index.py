@@ -0,0 +1,155 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from price_normalize import normalize_price
+
+INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'products.sqlite3')
+MIN_INDEX_HITS = 12
+MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+SEARCH_LIMIT = 40
+TOKEN_PATTERN = re.compile(r'\w+')
+TRACKING_PARAMS = ('utm_', 'srsltid', 'gclid', 'fbclid')
+ITEM_FIELDS = ('title', 'price', 'thumbnail', 'link', 'product_link', 'source')
+
+
+def normalize_link(link):
+    """Lowercase scheme/host and drop fragments and tracking parameters from a product URL"""
+    parts = urlsplit(link.strip())
+    query = [(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+             if not name.lower().startswith(TRACKING_PARAMS)]
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/'), urlencode(query), ''))
+
+
+def normalize_title(title):
+    return ' '.join(TOKEN_PATTERN.findall(str(title).lower()))
+
+
+def product_key(item):
+    """Stable identity for a listing: its normalized link, or its title and source when it has none"""
+    link = item.get('link') or item.get('product_link')
+    if link and link != '#':
+        return normalize_link(link)
+    return f"{normalize_title(item.get('title', ''))}|{str(item.get('source', '')).lower()}"
+
+
+def merge_unique(*result_lists):
+    """Concatenate result lists, keeping the first listing seen for each product key"""
+    seen = set()
+    merged = []
+    for results in result_lists:
+        for item in results:
+            key = product_key(item)
+            if key not in seen:
+                seen.add(key)
+                merged.append(item)
+    return merged
+
+
+class ProductIndex:
+    """SQLite FTS5 index of every listing we've fetched, with a sorted base-currency price column"""
+
+    def __init__(self, path=INDEX_PATH, max_age=MAX_AGE_SECONDS):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript('''
+            CREATE TABLE IF NOT EXISTS products (
+                id INTEGER PRIMARY KEY,
+                key TEXT UNIQUE NOT NULL,
+                title TEXT NOT NULL,
+                price REAL,
+                price_text TEXT,
+                source TEXT,
+                thumbnail TEXT,
+                link TEXT,
+                product_link TEXT,
+                seen_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS products_by_price ON products (price);
+            CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+                title, content='products', content_rowid='id'
+            );
+            CREATE TRIGGER IF NOT EXISTS products_ai AFTER INSERT ON products BEGIN
+                INSERT INTO products_fts (rowid, title) VALUES (new.id, new.title);
+            END;
+            CREATE TRIGGER IF NOT EXISTS products_ad AFTER DELETE ON products BEGIN
+                INSERT INTO products_fts (products_fts, rowid, title) VALUES ('delete', old.id, old.title);
+            END;
+            CREATE TRIGGER IF NOT EXISTS products_au AFTER UPDATE OF title ON products BEGIN
+                INSERT INTO products_fts (products_fts, rowid, title) VALUES ('delete', old.id, old.title);
+                INSERT INTO products_fts (rowid, title) VALUES (new.id, new.title);
+            END;
+        ''')
+
+    def add(self, results):
+        """Insert or refresh every listing in a result set"""
+        now = time.time()
+        rows = []
+        for item in results:
+            title = item.get('title')
+            if not title:
+                continue
+            price = normalize_price(item.get('price', '')).base_amount
+            rows.append((product_key(item), title, price, item.get('price'), item.get('source'),
+                         item.get('thumbnail'), item.get('link'), item.get('product_link'), now))
+        if not rows:
+            return
+        with self._lock:
+            self._db.executemany('''
+                INSERT INTO products (key, title, price, price_text, source, thumbnail, link, product_link, seen_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (key) DO UPDATE SET
+                    title = excluded.title, price = excluded.price, price_text = excluded.price_text,
+                    source = excluded.source, thumbnail = excluded.thumbnail, link = excluded.link,
+                    product_link = excluded.product_link, seen_at = excluded.seen_at
+            ''', rows)
+            self._db.commit()
+
+    def search(self, query, min_price=None, max_price=None, limit=SEARCH_LIMIT, max_age=None):
+        """Return indexed listings matching every query token, best match first, as result dicts.
+
+        Listings not seen within `max_age` seconds (default: the index's max_age) are skipped.
+        """
+        tokens = TOKEN_PATTERN.findall(str(query).lower())
+        if not tokens:
+            return []
+        match = ' '.join(f'"{token}"' for token in tokens)
+        sql = '''
+            SELECT p.title, p.price_text, p.thumbnail, p.link, p.product_link, p.source
+            FROM products_fts JOIN products p ON p.id = products_fts.rowid
+            WHERE products_fts MATCH ? AND p.seen_at >= ?
+        '''
+        params = [match, time.time() - (max_age if max_age is not None else self.max_age)]
+        if min_price:
+            sql += ' AND p.price >= ?'
+            params.append(min_price)
+        if max_price:
+            sql += ' AND p.price <= ?'
+            params.append(max_price)
+        sql += ' ORDER BY bm25(products_fts) LIMIT ?'
+        params.append(limit)
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [{field: value for field, value in zip(ITEM_FIELDS, row) if value is not None} for row in rows]
+
+    def search_or_fetch(self, query, fetch_page, min_hits=MIN_INDEX_HITS, min_price=None, max_price=None,
+                        max_age=None):
+        """Answer from the index when it covers the query within the price range, otherwise fetch, index and merge.
+
+        fetch_page(query) must return {'results': [...], 'has_next': bool}. An
+        index answer lists the in-range hits first, then the query's other hits,
+        so it can be re-filtered to another range like an API page; it keeps
+        has_next set so later pages still come from the API.
+        """
+        hits = self.search(query, min_price, max_price, max_age=max_age)
+        if len(hits) >= min_hits:
+            return {'results': merge_unique(hits, self.search(query, max_age=max_age)), 'has_next': True}
+        page = fetch_page(query)
+        self.add(page['results'])
+        return {'results': merge_unique(page['results'], hits), 'has_next': page['has_next']}
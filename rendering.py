@@ -0,0 +1,150 @@
+from html import escape
+
+CARD_BATCH_SIZE = 6
+
+# Injected once per page alongside the app stylesheet; cards only carry class names.
+CARD_STYLESHEET = """
+.snipe-grid {
+    display: grid;
+    grid-template-columns: repeat(2, minmax(0, 1fr));
+    gap: 20px;
+    margin-bottom: 20px;
+}
+
+@media (max-width: 640px) {
+    .snipe-grid {
+        grid-template-columns: 1fr;
+    }
+}
+
+.snipe-card {
+    background: linear-gradient(135deg, #fff9c4 0%, #fce4ec 50%, #e8f5e8 100%);
+    padding: 20px;
+    border-radius: 15px;
+    box-shadow: 0 10px 30px rgba(255,182,193,0.3);
+    border: 2px solid #ffeb3b;
+    text-align: center;
+}
+
+.snipe-thumb {
+    width: 100%;
+    max-width: 200px;
+    height: 200px;
+    object-fit: cover;
+    border-radius: 10px;
+    box-shadow: 0 5px 15px rgba(0,0,0,0.3);
+    margin-bottom: 15px;
+}
+
+.snipe-noimg {
+    padding: 60px 20px;
+    background: linear-gradient(135deg, #ffcccb, #ffe4e1);
+    border-radius: 10px;
+    margin-bottom: 15px;
+    color: #d32f2f;
+    border: 2px dashed #ff69b4;
+}
+
+.snipe-card h4 {
+    color: #2e7d32;
+    margin: 0 0 10px 0;
+    font-size: 16px;
+    line-height: 1.4;
+    font-weight: 600;
+    text-shadow: 1px 1px 2px rgba(255,255,255,0.8);
+}
+
+.snipe-price {
+    display: inline-block;
+    margin-bottom: 15px;
+    background: linear-gradient(135deg, #ffeb3b, #ff9800);
+    color: #d84315;
+    padding: 8px 16px;
+    border-radius: 20px;
+    font-size: 18px;
+    font-weight: bold;
+    box-shadow: 0 3px 10px rgba(255,152,0,0.4);
+    border: 2px solid #ff6f00;
+}
+
+.snipe-buy, .snipe-manual {
+    display: block;
+    padding: 12px 24px;
+    border-radius: 25px;
+    font-size: 16px;
+}
+
+.snipe-buy {
+    background: linear-gradient(135deg, #ff6b9d, #ffa726);
+    color: white !important;
+    font-weight: bold;
+    text-decoration: none !important;
+    transition: all 0.3s ease;
+    box-shadow: 0 4px 15px rgba(255, 107, 157, 0.4);
+}
+
+.snipe-buy:hover {
+    transform: translateY(-2px);
+    box-shadow: 0 6px 20px rgba(255, 107, 157, 0.6);
+}
+
+.snipe-manual {
+    background: linear-gradient(135deg, #e0e0e0, #bdbdbd);
+    color: #666;
+}
+
+.snipe-deal {
+    display: inline-block;
+    margin-bottom: 10px;
+    background: #d32f2f;
+    color: white;
+    padding: 4px 12px;
+    border-radius: 12px;
+    font-size: 14px;
+    font-weight: bold;
+}
+"""
+
+
+def render_card(item, thumb_url=None, discount=None):
+    """Render one result as a compact card that relies on CARD_STYLESHEET for styling"""
+    img = thumb_url or item.get("thumbnail")
+    if img:
+        thumb = f"<img class='snipe-thumb' src='{escape(img)}' loading='lazy'>"
+    else:
+        thumb = "<div class='snipe-noimg'>📷 No image available</div>"
+
+    title = escape(item.get("title", "No title"))
+    price = escape(str(item.get("price", "Price not available")))
+
+    link = item.get("link") or item.get("product_link") or item.get("serpapi_product_api")
+    if link and link != "#":
+        source = escape(item.get("source", ""))
+        action = (f"<a class='snipe-buy' href='{escape(link)}' target='_blank' "
+                  f"rel='noopener noreferrer'>🛒 Buy at {source}</a>")
+    else:
+        action = "<div class='snipe-manual'>🔍 Search manually</div>"
+
+    deal = f"<div class='snipe-deal'>🔥 {discount:.0%} below usual</div>" if discount else ""
+    return (f"<div class='snipe-card'>{thumb}{deal}<h4>{title}</h4>"
+            f"<div class='snipe-price'>💰 {price}</div>{action}</div>")
+
+
+def render_grid(items, thumbs=None, discounts=None):
+    """Render items as one card grid.
+
+    thumbs maps original thumbnail URLs to locally served ones; discounts is
+    aligned with items and holds each card's deal discount, if any.
+    """
+    thumbs = thumbs or {}
+    discounts = discounts or [None] * len(items)
+    cards = ''.join(render_card(item, thumbs.get(item.get("thumbnail")), discount)
+                    for item, discount in zip(items, discounts))
+    return f"<div class='snipe-grid'>{cards}</div>"
+
+
+def iter_grid_batches(items, batch_size=CARD_BATCH_SIZE, thumbs=None, discounts=None):
+    """Yield one grid of HTML per batch of items, so each st.markdown call stays small"""
+    for start in range(0, len(items), batch_size):
+        end = start + batch_size
+        yield render_grid(items[start:end], thumbs, discounts[start:end] if discounts else None)
@@ -0,0 +1,321 @@
+"""Search results UI, imported by main.py once a search has been submitted."""
+from itertools import chain
+
+import requests
+import streamlit as st
+
+from backends import BUDGETS, ENGINES, HEDGE_DEADLINE, build_search
+from dedupe import DuplicateFilter, combine_results
+from fetcher import BASE_URL, EMPTY_PAGE, PAGE_SIZE, fetch_concurrently, load_api_key
+from image_cache import ImageCache
+from paginator import iter_in_price_range, iter_pages
+from prices import ProductTable
+from rendering import CARD_BATCH_SIZE, iter_grid_batches
+from search import SearchService
+from tracing import Trace, activate, span
+from warmer import QueryStats
+
+MAX_DISPLAYED = 6
+COMBINED_KEY = "__combined__"
+SORT_LABELS = {"Best match": "relevance", "Price: low to high": "price_low", "Price: high to low": "price_high"}
+
+
+@st.cache_resource
+def get_search_service():
+    api_key = load_api_key()
+    return SearchService(api_key, upstream=build_search(ENGINES, api_key, base_url=BASE_URL,
+                                                        hedge_deadline=HEDGE_DEADLINE, budgets=BUDGETS))
+
+
+@st.cache_resource
+def get_query_stats():
+    # Read by warmer.py, which runs as its own process.
+    return QueryStats()
+
+
+@st.cache_resource
+def get_image_cache():
+    return ImageCache()
+
+
+def show_more(query):
+    limits = st.session_state.setdefault("display_limits", {})
+    limits[query] = limits.get(query, MAX_DISPLAYED) + CARD_BATCH_SIZE
+
+
+def display_results(results, show_price_stats=True, limit=MAX_DISPLAYED):
+    if not results:
+        return
+
+    table = results if isinstance(results, ProductTable) else ProductTable.from_results(results)
+    results = table.items
+
+    if show_price_stats and len(results) > 1:
+        stats = table.price_stats()
+        if stats:
+            min_price, avg_price, max_price = stats
+
+            st.markdown(f"""
+            <div style='
+                background: linear-gradient(135deg, #e8f5e8, #fff3e0);
+                padding: 15px;
+                border-radius: 12px;
+                margin-bottom: 20px;
+                border: 2px solid #4caf50;
+                text-align: center;
+            '>
+                <h4 style='color: #2e7d32; margin: 0 0 10px 0;'>💰 Price Range Summary</h4>
+                <div style='display: flex; justify-content: space-around; flex-wrap: wrap;'>
+                    <span style='color: #388e3c; font-weight: bold;'>Min: ${min_price:.2f}</span>
+                    <span style='color: #f57c00; font-weight: bold;'>Avg: ${avg_price:.2f}</span>
+                    <span style='color: #d32f2f; font-weight: bold;'>Max: ${max_price:.2f}</span>
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+
+    shown = results[:limit]
+    # Never wait on downloads here: missing thumbnails use their original URL and later reruns pick up the local copy.
+    thumbs = get_image_cache().localize((item.get("thumbnail") for item in shown), timeout=0)
+    history = get_search_service().price_history
+    discounts = [history.deal_discount(item) for item in shown]
+    with span("render", items=len(shown)) as render_span:
+        sent = 0
+        for grid_html in iter_grid_batches(shown, thumbs=thumbs, discounts=discounts):
+            st.markdown(grid_html, unsafe_allow_html=True)
+            sent += len(grid_html)
+        render_span.set(bytes=sent)
+
+
+def display_no_price_matches(min_price, max_price):
+    st.markdown(f"""
+    <div style='
+        text-align: center;
+        padding: 40px;
+        background: linear-gradient(135deg, #ffcccb, #ffe4e1);
+        border-radius: 15px;
+        margin: 20px 0;
+        border: 2px dashed #ff69b4;
+    '>
+        <h4 style='color: #d32f2f; text-shadow: 1px 1px 2px rgba(255,255,255,0.8);'>💸 No items found in price range ${min_price:.0f} - ${max_price:.0f}</h4>
+        <p style='color: #f57c00; font-weight: 500;'>Try adjusting your price filter or search terms</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+
+def display_query_results(query, first_page, min_price, max_price, fetch_page, limit=MAX_DISPLAYED,
+                          duplicates=None):
+    if first_page['results']:
+        low = min_price if min_price > 0 else None
+        high = max_price if max_price < 1000 else None
+
+        pages = [first_page]
+        if first_page['has_next']:
+            # Narrow price ranges and "load more" keep pulling later pages until the grid is full.
+            later_pages = iter_pages(lambda start: fetch_page(query, start), start=PAGE_SIZE)
+            pages = chain(pages, later_pages)
+        if duplicates is not None:
+            # Products already shown under another search term are dropped here, as are repeats within this
+            # query; only the cards rendered below are marked as shown for the terms after it.
+            own = DuplicateFilter()
+            pages = (dict(page, results=[item for item in page['results']
+                                         if not duplicates.seen(item) and own.add(item)[1]])
+                     for page in pages)
+
+        summary = st.empty()
+        grid = st.empty()
+        scanned = 0
+        tables = []
+        filtered_results = None
+        has_next = False
+        try:
+            for page, table in iter_in_price_range(pages, low, high, wanted=limit + 1):
+                scanned += len(page['results'])
+                has_next = page['has_next']
+                tables.append(table)
+                filtered_results = ProductTable.concat(tables)
+                if not filtered_results:
+                    continue
+
+                if len(filtered_results) != scanned:
+                    summary.markdown(f"""
+                    <div style='
+                        background: linear-gradient(135deg, #e8f5e8, #f3e5f5);
+                        padding: 10px;
+                        border-radius: 8px;
+                        margin-bottom: 15px;
+                        text-align: center;
+                        border: 1px solid #4caf50;
+                    '>
+                        <span style='color: #2e7d32; font-weight: bold;'>
+                            📊 Showing {len(filtered_results)} of {scanned} items in your price range
+                        </span>
+                    </div>
+                    """, unsafe_allow_html=True)
+
+                with grid.container():
+                    display_results(filtered_results, limit=limit)
+        except requests.exceptions.RequestException:
+            pass
+
+        if duplicates is not None and filtered_results:
+            for item in filtered_results.items[:limit]:
+                duplicates.add(item)
+
+        if filtered_results and (len(filtered_results) > limit or has_next):
+            st.button("✨ Load more", key=f"load_more_{query}", on_click=show_more, args=(query,))
+
+        if not filtered_results:
+            display_no_price_matches(min_price, max_price)
+    else:
+        st.markdown("""
+        <div style='
+            text-align: center;
+            padding: 40px;
+            background: linear-gradient(135deg, #ffcccb, #ffe4e1);
+            border-radius: 15px;
+            margin: 20px 0;
+            border: 2px dashed #ff69b4;
+        '>
+            <h4 style='color: #d32f2f; text-shadow: 1px 1px 2px rgba(255,255,255,0.8);'>😔 No results found for this search</h4>
+            <p style='color: #f57c00; font-weight: 500;'>Try different keywords or check your spelling</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+
+def display_timing_panel(trace):
+    """Debug breakdown of where this run's time went, with the raw spans for offline analysis"""
+    stages, cache = trace.breakdown()
+    with st.expander("⏱️ Timing breakdown for this run", expanded=True):
+        st.table([
+            {"Stage": stage, "Spans": totals["count"], "Total ms": round(totals["seconds"] * 1000, 1),
+             "Bytes": totals["bytes"]}
+            for stage, totals in stages.items()
+        ])
+        if cache:
+            answered = ", ".join(f"{layer} × {count}" for layer, count in sorted(cache.items()))
+            st.caption(f"Searches answered by: {answered}")
+        st.caption("fetch and decode run on worker threads, so stage totals can exceed the wall-clock time.")
+        export_col1, export_col2 = st.columns([1, 1])
+        with export_col1:
+            st.download_button("Prometheus metrics", trace.to_prometheus(), file_name="snipestyle_metrics.txt",
+                               mime="text/plain")
+        with export_col2:
+            st.download_button("OpenTelemetry JSON", trace.to_otel_json(), file_name="snipestyle_trace.json",
+                               mime="application/json")
+
+
+def display_combined_results(pages_by_query, min_price, max_price, sort, limit=MAX_DISPLAYED):
+    combined = combine_results({query: page['results'] for query, page in pages_by_query.items()}, sort)
+    filtered_results = ProductTable.from_results(combined).filter_by_price(
+        min_price if min_price > 0 else None,
+        max_price if max_price < 1000 else None
+    )
+
+    st.markdown(f"""
+    <div class='results-header'>
+        <h3 style='
+            color: #d32f2f;
+            margin: 0;
+            font-size: 24px;
+            text-shadow: 1px 1px 2px rgba(255,255,255,0.8);
+        '>🧩 Combined results for {len(pages_by_query)} searches</h3>
+    </div>
+    """, unsafe_allow_html=True)
+
+    if filtered_results:
+        display_results(filtered_results, limit=limit)
+        if len(filtered_results) > limit:
+            st.button("✨ Load more", key="load_more_combined", on_click=show_more, args=(COMBINED_KEY,))
+    else:
+        display_no_price_matches(min_price, max_price)
+
+
+def show_search_results(queries, submitted, min_price, max_price):
+    """Render everything below the search form for the submitted (or last) search"""
+    if submitted:
+        get_query_stats().record(queries)
+        st.session_state["searched"] = True
+        st.session_state["display_limits"] = {}
+        st.session_state["pages"] = {
+            key: page for key, page in st.session_state.get("pages", {}).items() if key[0] in queries
+        }
+
+    if min_price > 0 or max_price < 1000:
+        st.markdown(f"""
+        <div style='
+            background: linear-gradient(135deg, #fff3e0, #fce4ec);
+            padding: 15px;
+            border-radius: 12px;
+            margin: 20px 0;
+            border: 2px solid #ff9800;
+            text-align: center;
+        '>
+            <h4 style='color: #f57c00; margin: 0;'>🎯 Active Price Filter: ${min_price:.0f} - ${max_price:.0f}</h4>
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.markdown("""
+    <div style='text-align: center; margin: 30px 0;'>
+        <h2 style='color: #2e7d32; font-size: 28px; text-shadow: 1px 1px 2px rgba(255,255,255,0.8);'>🎉 Your Fashion Finds</h2>
+    </div>
+    """, unsafe_allow_html=True)
+
+    view_col1, view_col2, view_col3 = st.columns([1, 1, 1])
+    with view_col1:
+        combined_view = st.checkbox("🧩 Combine results into one list", key="combined_view")
+    with view_col2:
+        sort_label = st.selectbox("Sort combined results by", list(SORT_LABELS), key="combined_sort",
+                                  disabled=not combined_view)
+    with view_col3:
+        show_timing = st.checkbox("⏱️ Show timing breakdown", key="show_timing")
+
+    queries = list(dict.fromkeys(queries))
+    fetch_page = get_search_service().session_fetcher(st.session_state.setdefault("pages", {}),
+                                                      min_price if min_price > 0 else None,
+                                                      max_price if max_price < 1000 else None)
+    limits = st.session_state.get("display_limits", {})
+
+    with activate(Trace() if show_timing else None) as trace:
+        if combined_view:
+            pages_by_query = {}
+            with st.spinner("Sniping the best deals across all your searches..."):
+                for query, page, error in fetch_concurrently(queries, fetch_page):
+                    if error:
+                        st.error(f"Error fetching data for '{query}': {error}")
+                    pages_by_query[query] = page or EMPTY_PAGE
+            ordered = {query: pages_by_query[query] for query in queries}
+            display_combined_results(ordered, min_price, max_price, SORT_LABELS[sort_label],
+                                     limits.get(COMBINED_KEY, MAX_DISPLAYED))
+        else:
+            slots = {}
+            for query in queries:
+                slot = st.container()
+                with slot:
+                    st.markdown(f"""
+                    <div class='results-header'>
+                        <h3 style='
+                            color: #d32f2f;
+                            margin: 0;
+                            font-size: 24px;
+                            text-shadow: 1px 1px 2px rgba(255,255,255,0.8);
+                        '>👗 Results for: "<span style='color: #ff6b9d;'>{query}</span>"</h3>
+                    </div>
+                    """, unsafe_allow_html=True)
+                    status = st.empty()
+                    status.info(f"Sniping the best {query} deals...")
+                slots[query] = (slot, status)
+
+            # Queries render in completion order, so a product found by several
+            # terms stays under whichever one finished first.
+            duplicates = DuplicateFilter()
+            for query, page, error in fetch_concurrently(queries, fetch_page):
+                slot, status = slots[query]
+                status.empty()
+                with slot:
+                    if error:
+                        st.error(f"Error fetching data for '{query}': {error}")
+                    display_query_results(query, page or EMPTY_PAGE, min_price, max_price, fetch_page,
+                                          limits.get(query, MAX_DISPLAYED), duplicates)
+
+    if trace is not None:
+        display_timing_panel(trace)
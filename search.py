@@ -0,0 +1,99 @@
+import time
+
+from backends import FederatedSearch, GoogleShoppingBackend
+from cache import ResponseCache, make_cache_key
+from client import CircuitOpenError
+from fetcher import BASE_URL, EMPTY_PAGE
+from price_history import PriceHistory
+from product_index import ProductIndex
+from singleflight import SingleFlight
+from tracing import annotate, span
+
+
+class SearchService:
+    """The search pipeline behind the UI, free of Streamlit so batch jobs and load tests can drive it.
+
+    Lookups go session memo -> product index -> response cache -> single-flight
+    -> upstream, and every upstream page is recorded in the price history. The
+    upstream is any backend from backends.py (Google Shopping by default) or a
+    FederatedSearch over several, which then caches each backend's page too.
+    """
+
+    def __init__(self, api_key, base_url=BASE_URL, client=None, response_cache=None, single_flight=None,
+                 product_index=None, price_history=None, upstream=None):
+        self.upstream = upstream or GoogleShoppingBackend(api_key, base_url=base_url, client=client)
+        self.response_cache = response_cache or ResponseCache()
+        if isinstance(self.upstream, FederatedSearch) and self.upstream.cache is None:
+            # Per-backend pages go in the same cache, so hedged-out stragglers still count next time.
+            self.upstream.cache = self.response_cache
+        self.single_flight = single_flight or SingleFlight()
+        self.product_index = product_index or ProductIndex()
+        self.price_history = price_history or PriceHistory()
+
+    def fetch_upstream(self, query, start=0):
+        page = self.upstream.search(query, start)
+        self.price_history.record(page['results'])
+        return page
+
+    def fetch_query(self, query, start=0):
+        key = make_cache_key(query, engine=self.upstream.name, start=start)
+        annotate(cache='hit')
+
+        def fetch():
+            annotate(cache='miss')
+            return self.single_flight.do(key, lambda: self.fetch_upstream(query, start))
+
+        try:
+            # Hedged pages that dropped a slow backend are served but not cached.
+            return self.response_cache.get_or_fetch(key, fetch, cacheable=lambda page: not page.get('partial'))
+        except CircuitOpenError:
+            return EMPTY_PAGE
+
+    def cache_age(self, query, start=0):
+        """Seconds since the cached page for query was fetched, or None if it is not cached"""
+        entry = self.response_cache.get(make_cache_key(query, engine=self.upstream.name, start=start))
+        return None if entry is None else time.time() - entry[1]
+
+    def refresh(self, query, start=0):
+        """Fetch a page upstream regardless of what is cached, and store it in the response cache and index"""
+        key = make_cache_key(query, engine=self.upstream.name, start=start)
+        page = self.single_flight.do(key, lambda: self.fetch_upstream(query, start))
+        if not page.get('partial'):
+            self.response_cache.set(key, page)
+        self.product_index.add(page['results'])
+        return page
+
+    def fetch_indexed(self, query, start=0, min_price=None, max_price=None):
+        """Serve the first page from the local product index when it covers the query, indexing every API page.
+
+        Only listings seen within the response cache TTL count, so popular
+        queries still go back to the API (and the price history) as often as
+        cached pages would.
+        """
+        if start == 0:
+            annotate(cache='index')
+            return self.product_index.search_or_fetch(query, self.fetch_query, min_price=min_price,
+                                                      max_price=max_price, max_age=self.response_cache.ttl)
+        page = self.fetch_query(query, start)
+        self.product_index.add(page['results'])
+        return page
+
+    def session_fetcher(self, memo, min_price=None, max_price=None):
+        """Wrap fetch_indexed with a per-session memo of raw pages, so re-filtering never refetches.
+
+        `memo` is the plain dict kept in st.session_state; it is passed in rather
+        than looked up because the fetch runs on worker threads. The price range
+        only decides whether the product index covers a first page; pages are
+        memoized unfiltered and callers apply the range themselves.
+        """
+        def fetch(query, start=0):
+            key = (query, start)
+            with span('search', query=query, start=start, cache='session') as search_span:
+                page = memo.get(key)
+                if page is None:
+                    page = self.fetch_indexed(query, start, min_price, max_price)
+                    if page['results']:
+                        memo[key] = page
+                search_span.set(items=len(page['results']))
+            return page
+        return fetch
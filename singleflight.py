@@ -0,0 +1,60 @@
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one upstream call shared by every caller"""
+
+    def __init__(self):
+        self.stats = {'upstream_calls': 0, 'saved_calls': 0}
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fetch):
+        """Return fetch() for key, joining an identical call that is already in flight"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.stats['upstream_calls'] += 1
+            else:
+                call.waiters += 1
+                self.stats['saved_calls'] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fetch()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self):
+        """Number of distinct upstream calls currently running"""
+        with self._lock:
+            return len(self._calls)
+
+    def waiters(self, key=None):
+        """Number of callers currently waiting on an in-flight call, for one key or all keys"""
+        with self._lock:
+            if key is not None:
+                call = self._calls.get(key)
+                return call.waiters if call else 0
+            return sum(call.waiters for call in self._calls.values())
@@ -0,0 +1,179 @@
+"""Lightweight per-run tracing for the search hot path.
+
+Spans are only recorded while a Trace is active in the current context (see
+`activate`); otherwise `span()` is a ContextVar lookup returning a shared
+no-op, so instrumented code pays almost nothing. Worker threads inherit the
+active trace and parent span when their callable is wrapped with `bind`.
+"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from functools import partial
+
+SERVICE_NAME = 'snipestyle'
+STAGES = ('search', 'fetch', 'decode', 'parse', 'filter', 'render')
+
+_trace = ContextVar('trace', default=None)
+_span = ContextVar('span', default=None)
+
+
+class Span:
+    __slots__ = ('name', 'span_id', 'parent_id', 'start', 'end', 'attributes', '_token')
+
+    def __init__(self, name, span_id, parent_id, attributes):
+        self.name = name
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start = self.end = None
+        self._token = None
+
+    @property
+    def duration(self):
+        return (self.end or time.time_ns()) - self.start
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def __enter__(self):
+        self.start = time.time_ns()
+        self._token = _span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end = time.time_ns()
+        _span.reset(self._token)
+        if exc_type is not None:
+            self.attributes['error'] = exc_type.__name__
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, **attributes):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    """Every span recorded during one run, with Prometheus and OTLP-style JSON exports"""
+
+    def __init__(self):
+        self.trace_id = os.urandom(16).hex()
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def start_span(self, name, attributes):
+        parent = _span.get()
+        span = Span(name, os.urandom(8).hex(), parent.span_id if parent else None, attributes)
+        with self._lock:
+            self.spans.append(span)
+        return span
+
+    def breakdown(self):
+        """Per-stage totals as {stage: {'count', 'seconds', 'bytes'}} plus cache results under 'cache'"""
+        stages = {stage: {'count': 0, 'seconds': 0.0, 'bytes': 0} for stage in STAGES}
+        cache = defaultdict(int)
+        for span in list(self.spans):
+            totals = stages.setdefault(span.name, {'count': 0, 'seconds': 0.0, 'bytes': 0})
+            totals['count'] += 1
+            totals['seconds'] += span.duration / 1e9
+            totals['bytes'] += span.attributes.get('bytes', 0)
+            if 'cache' in span.attributes:
+                cache[span.attributes['cache']] += 1
+        return stages, dict(cache)
+
+    def to_prometheus(self):
+        stages, cache = self.breakdown()
+        lines = [
+            f'# HELP {SERVICE_NAME}_stage_seconds Time spent per hot-path stage in this run.',
+            f'# TYPE {SERVICE_NAME}_stage_seconds summary',
+        ]
+        for stage, totals in stages.items():
+            lines.append(f'{SERVICE_NAME}_stage_seconds_sum{{stage="{stage}"}} {totals["seconds"]:.6f}')
+            lines.append(f'{SERVICE_NAME}_stage_seconds_count{{stage="{stage}"}} {totals["count"]}')
+        lines += [
+            f'# HELP {SERVICE_NAME}_stage_bytes_total Bytes handled per stage in this run.',
+            f'# TYPE {SERVICE_NAME}_stage_bytes_total counter',
+        ]
+        for stage, totals in stages.items():
+            lines.append(f'{SERVICE_NAME}_stage_bytes_total{{stage="{stage}"}} {totals["bytes"]}')
+        lines += [
+            f'# HELP {SERVICE_NAME}_cache_lookups_total Search lookups by the layer that answered them.',
+            f'# TYPE {SERVICE_NAME}_cache_lookups_total counter',
+        ]
+        for result, count in sorted(cache.items()):
+            lines.append(f'{SERVICE_NAME}_cache_lookups_total{{result="{result}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+    def to_otel_json(self):
+        """Spans in the OTLP/JSON trace layout, ready for an OpenTelemetry collector's HTTP receiver"""
+        spans = [{
+            'traceId': self.trace_id,
+            'spanId': span.span_id,
+            'parentSpanId': span.parent_id or '',
+            'name': span.name,
+            'kind': 1,
+            'startTimeUnixNano': str(span.start),
+            'endTimeUnixNano': str(span.end or span.start),
+            'attributes': [{'key': key, 'value': _otel_value(value)} for key, value in span.attributes.items()],
+        } for span in list(self.spans)]
+        return json.dumps({'resourceSpans': [{
+            'resource': {'attributes': [{'key': 'service.name', 'value': {'stringValue': SERVICE_NAME}}]},
+            'scopeSpans': [{'scope': {'name': SERVICE_NAME}, 'spans': spans}],
+        }]})
+
+
+def _otel_value(value):
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def span(name, **attributes):
+    """Context manager timing one stage; a no-op unless a trace is active"""
+    trace = _trace.get()
+    if trace is None:
+        return NOOP_SPAN
+    return trace.start_span(name, attributes)
+
+
+def annotate(**attributes):
+    """Attach attributes to the innermost open span, if any"""
+    current = _span.get()
+    if current is not None:
+        current.attributes.update(attributes)
+
+
+@contextmanager
+def activate(trace):
+    """Record spans into `trace` for the duration of the block (None leaves tracing off)"""
+    token = _trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _trace.reset(token)
+
+
+def bind(fn):
+    """Wrap fn to run in a copy of the caller's context, so spans from a worker thread join the active trace"""
+    if _trace.get() is None:
+        return fn
+    return partial(copy_context().run, fn)
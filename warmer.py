@@ -0,0 +1,200 @@
+"""Background refresh of popular searches, run next to the app as its own process.
+
+The app records each form submission in the shared query stats database;
+this process refreshes the trending and seed queries in the shared response
+cache, so they are warm from the moment it starts, before anyone searches.
+
+    python warmer.py            # refresh every five minutes
+    python warmer.py --once     # one cycle, e.g. from cron
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+import requests
+
+from backends import BUDGETS, ENGINES, HEDGE_DEADLINE, build_search
+from client import QuotaBudget
+from fetcher import BASE_URL, PAGE_SIZE, load_api_key
+from search import SearchService
+
+STATS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'queries.sqlite3')
+# The search form's placeholder examples, warmed from the first cycle even if nobody has searched yet.
+SEED_QUERIES = ('designer sneakers', 'vintage jacket', 'luxury handbag')
+HALF_LIFE_SECONDS = 24 * 60 * 60
+TOP_N = 20
+SECOND_PAGE_TOP_N = 5
+INTERVAL_SECONDS = 5 * 60
+MAX_BACKOFF_SECONDS = 60 * 60
+REFRESH_AFTER = 0.8
+WARM_QUOTA = 120
+WARM_QUOTA_PERIOD = 60 * 60
+BUSY_IN_FLIGHT = 4
+BUSY_SUBMISSIONS_PER_MINUTE = 20
+FETCH_GAP_SECONDS = 0.5
+
+
+def normalize_query(query):
+    return ' '.join(str(query).lower().split())
+
+
+class QueryStats:
+    """Exponentially decayed submission counts per query, persisted in SQLite.
+
+    A submission adds 1 to a query's score and scores halve every
+    `half_life` seconds, so the ranking follows what is trending now. The
+    last minute of submission times is kept too, so a warmer in another
+    process can tell when live traffic is busy.
+    """
+
+    def __init__(self, path=STATS_PATH, half_life=HALF_LIFE_SECONDS):
+        self.half_life = half_life
+        self._lock = threading.Lock()
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS query_scores (query TEXT PRIMARY KEY, score REAL NOT NULL, updated REAL NOT NULL)'
+        )
+        self._db.execute('CREATE TABLE IF NOT EXISTS submissions (submitted REAL NOT NULL)')
+
+    def record(self, queries, now=None):
+        now = now if now is not None else time.time()
+        with self._lock:
+            for query in {normalize_query(query) for query in queries if str(query).strip()}:
+                row = self._db.execute('SELECT score, updated FROM query_scores WHERE query = ?', (query,)).fetchone()
+                score = self._decayed(row[0], row[1], now) + 1 if row else 1.0
+                self._db.execute('INSERT OR REPLACE INTO query_scores (query, score, updated) VALUES (?, ?, ?)',
+                                 (query, score, now))
+            self._db.execute('INSERT INTO submissions (submitted) VALUES (?)', (now,))
+            self._db.execute('DELETE FROM submissions WHERE submitted < ?', (now - 60,))
+            # Queries unseen for ten half-lives have decayed below 0.1% of one submission.
+            self._db.execute('DELETE FROM query_scores WHERE updated < ?', (now - 10 * self.half_life,))
+            self._db.commit()
+
+    def recent_submissions(self, seconds=60, now=None):
+        """Number of form submissions in the last `seconds` (at most 60), from any process"""
+        now = now if now is not None else time.time()
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM submissions WHERE submitted >= ?',
+                                    (now - seconds,)).fetchone()[0]
+
+    def top(self, n=TOP_N, now=None):
+        """Return the n highest-scoring queries, best first"""
+        now = now if now is not None else time.time()
+        with self._lock:
+            rows = self._db.execute('SELECT query, score, updated FROM query_scores').fetchall()
+        rows.sort(key=lambda row: self._decayed(row[1], row[2], now), reverse=True)
+        return [row[0] for row in rows[:n]]
+
+    def _decayed(self, score, updated, now):
+        return score * 0.5 ** ((now - updated) / self.half_life)
+
+
+class CacheWarmer:
+    """Keeps popular searches warm by refreshing them in the background.
+
+    Every `interval` seconds the top-N queries by decayed frequency, plus the
+    seed queries, are refreshed through the SearchService once their cached
+    page is missing or older than REFRESH_AFTER of the cache TTL; the top few
+    also get their second page, which narrow price filters usually need.
+    Refreshes draw on their own quota and stop as soon as live traffic is
+    busy (too many upstream calls in flight or too many recent submissions),
+    doubling the wait before the next cycle up to `max_backoff`.
+    """
+
+    def __init__(self, service, stats=None, top_n=TOP_N, seed_queries=SEED_QUERIES, interval=INTERVAL_SECONDS,
+                 max_backoff=MAX_BACKOFF_SECONDS, quota=WARM_QUOTA, quota_period=WARM_QUOTA_PERIOD,
+                 busy_in_flight=BUSY_IN_FLIGHT, busy_submissions=BUSY_SUBMISSIONS_PER_MINUTE):
+        self.service = service
+        self.stats = stats or QueryStats()
+        self.top_n = top_n
+        self.seed_queries = seed_queries
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self.quota = QuotaBudget(quota, quota_period)
+        self.busy_in_flight = busy_in_flight
+        self.busy_submissions = busy_submissions
+        self.counters = {'cycles': 0, 'refreshed': 0, 'fresh': 0, 'deferred': 0, 'errors': 0}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def busy(self):
+        # in_flight() only sees this process's calls; submissions are shared through the stats database.
+        return (self.stats.recent_submissions() >= self.busy_submissions
+                or self.service.single_flight.in_flight() >= self.busy_in_flight)
+
+    def targets(self):
+        """(query, start) pairs to keep warm, most popular first"""
+        popular = self.stats.top(self.top_n)
+        queries = list(dict.fromkeys(popular + [normalize_query(query) for query in self.seed_queries]))
+        pages = [(query, 0) for query in queries]
+        pages += [(query, PAGE_SIZE) for query in popular[:SECOND_PAGE_TOP_N]]
+        return pages
+
+    def warm_once(self):
+        """Run one refresh cycle; returns False if it stopped early because of traffic or quota"""
+        self.counters['cycles'] += 1
+        max_age = REFRESH_AFTER * self.service.response_cache.ttl
+        for query, start in self.targets():
+            age = self.service.cache_age(query, start)
+            if age is not None and age < max_age:
+                self.counters['fresh'] += 1
+                continue
+            if self.busy() or not self.quota.try_acquire():
+                self.counters['deferred'] += 1
+                return False
+            try:
+                self.service.refresh(query, start)
+                self.counters['refreshed'] += 1
+            except requests.exceptions.RequestException:
+                self.counters['errors'] += 1
+            if self._stop.wait(FETCH_GAP_SECONDS):
+                return False
+        return True
+
+    def start(self):
+        """Run the refresh loop on a daemon thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run, name='cache-warmer', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self):
+        """Refresh every `interval` seconds, starting now, until stop() is called"""
+        delay = 0
+        while not self._stop.wait(delay):
+            completed = self.warm_once()
+            delay = self.interval if completed else min(self.max_backoff, max(delay, self.interval) * 2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Keep popular searches warm in the shared response cache.')
+    parser.add_argument('--once', action='store_true', help='run one refresh cycle and exit')
+    parser.add_argument('--interval', type=float, default=INTERVAL_SECONDS, help='seconds between cycles')
+    args = parser.parse_args(argv)
+
+    # Same backends and caches as the app (SNIPESTYLE_ENGINES etc.), so refreshed pages are the ones it reads.
+    api_key = load_api_key()
+    service = SearchService(api_key, upstream=build_search(ENGINES, api_key, base_url=BASE_URL,
+                                                           hedge_deadline=HEDGE_DEADLINE, budgets=BUDGETS))
+    warmer = CacheWarmer(service, interval=args.interval)
+    try:
+        if args.once:
+            warmer.warm_once()
+        else:
+            warmer.run()
+    except KeyboardInterrupt:
+        pass
+    print(f'cache warmer: {warmer.counters}', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())